@@ -0,0 +1,268 @@
+"""
+Performance benchmarks of @parametrize, with @pytest.mark.parametrize as a baseline
+
+For each number of cases and decorators stack depth it measures:
+  - decoration: best time of several imports of a module with parametrized test function
+  - memory: peak and retained memory of that import (tracemalloc)
+  - unittest_collection: time to load tests with unittest.TestLoader
+  - pytest_collection: time of `pytest --collect-only` in a subprocess
+  - call_overhead: time added to each call of parametrized method
+
+Usage:
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --cases 10 1000 --depths 1 2 --compare results.json
+"""
+import argparse
+import gc
+import importlib
+import importlib.util
+import itertools
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import unittest
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_CASES = (10, 100, 1_000, 10_000, 100_000)
+DEFAULT_DEPTHS = (1, 2, 3)
+IMPLEMENTATIONS = ("parametrize", "pytest")
+
+_module_counter = itertools.count()
+
+
+def values_per_decorator(cases: int, depth: int) -> int:
+    return max(1, math.ceil(round(cases ** (1 / depth), 6)))
+
+
+def make_module_source(implementation: str, cases: int, depth: int, test_case: bool = False) -> str:
+    """
+    Module with a single parametrized test, a function or a method of unittest.TestCase
+
+    Only the test differs between implementations, so their modules have the same number of cases.
+    """
+    size = values_per_decorator(cases, depth)
+    argnames = [f"a{i}" for i in range(depth)]
+    decorator = "parametrize" if implementation == "parametrize" else "pytest.mark.parametrize"
+    decorators = "".join(f"    @{decorator}({name!r}, range({size}))\n" for name in argnames)
+    arguments = ", ".join(argnames)
+
+    source = "import unittest\nfrom parametrize import parametrize\n"
+    source += "import pytest\n\n\n" if implementation == "pytest" else "\n\n"
+    if test_case:
+        # unittest can only be used with @parametrize
+        assert implementation == "parametrize"
+        source += "class TestBenchmark(unittest.TestCase):\n"
+        source += f"{decorators}    def test_method(self, {arguments}):\n        pass\n"
+    else:
+        source += f"{decorators.replace('    ', '')}def test_function({arguments}):\n    pass\n"
+    return source
+
+
+def write_module(
+    directory: Path, implementation: str, cases: int, depth: int, test_case: bool = False
+) -> str:
+    kind = "unittest" if test_case else implementation
+    name = f"bench_{kind}_{cases}_{depth}_{next(_module_counter)}"
+    source = make_module_source(implementation, cases, depth, test_case)
+    (directory / f"{name}.py").write_text(source)
+    return name
+
+
+def import_fresh(
+    directory: Path,
+    implementation: str,
+    cases: int,
+    depth: int,
+    test_case: bool = False,
+    repeat: int = 5,
+):
+    """
+    Imports a new copy of module several times and returns the last one with the best time
+    """
+    timings = []
+    for _ in range(repeat):
+        name = write_module(directory, implementation, cases, depth, test_case)
+        gc.collect()
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        timings.append(time.perf_counter() - start)
+        if len(timings) < repeat:
+            del sys.modules[name], module
+    return module, min(timings)
+
+
+def measure_memory(directory: Path, implementation: str, cases: int, depth: int):
+    name = write_module(directory, implementation, cases, depth)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        module = importlib.import_module(name)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del sys.modules[name], module
+    return {"peak_bytes": peak, "retained_bytes": retained}
+
+
+def measure_unittest_collection(module) -> float:
+    start = time.perf_counter()
+    suite = unittest.defaultTestLoader.loadTestsFromTestCase(module.TestBenchmark)
+    elapsed = time.perf_counter() - start
+    assert suite.countTestCases()
+    return elapsed
+
+
+def measure_pytest_collection(directory: Path, module_name: str) -> Optional[float]:
+    command = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "--collect-only",
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        f"{module_name}.py",
+    ]
+    start = time.perf_counter()
+    completed = subprocess.run(
+        command,
+        cwd=directory,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed if completed.returncode == 0 else None
+
+
+def measure_call_overhead(module, number: int = 10_000) -> float:
+    """
+    Seconds added to every call by parametrized method compared to calling original function
+    """
+    name = next(name for name in vars(module.TestBenchmark) if name.startswith("test_method["))
+    instance = module.TestBenchmark(name)
+    method = getattr(instance, name)
+    original = vars(module.TestBenchmark)["test_method"].func
+    parameters = vars(module.TestBenchmark)[name].context.get_case_parameters(0)
+
+    parametrized = min(timeit.repeat(method, number=number, repeat=5))
+    direct = min(timeit.repeat(lambda: original(instance, **parameters), number=number, repeat=5))
+    return (parametrized - direct) / number
+
+
+def run(cases_options, depths, with_pytest: bool) -> Iterator[Dict[str, Any]]:
+    # imports of libraries themselves shouldn't be measured
+    importlib.import_module("parametrize")
+    if with_pytest:
+        importlib.import_module("pytest")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        sys.path.insert(0, temp_dir)
+        try:
+            for cases, depth, implementation in itertools.product(
+                cases_options, depths, IMPLEMENTATIONS
+            ):
+                if implementation == "pytest" and not with_pytest:
+                    continue
+                actual_cases = values_per_decorator(cases, depth) ** depth
+                base = {"implementation": implementation, "cases": actual_cases, "depth": depth}
+
+                module, elapsed = import_fresh(directory, implementation, cases, depth)
+                yield {**base, "benchmark": "decoration", "seconds": elapsed}
+                memory = measure_memory(directory, implementation, cases, depth)
+                yield {**base, "benchmark": "memory", **memory}
+
+                if implementation == "parametrize":
+                    test_case, _ = import_fresh(
+                        directory, implementation, cases, depth, test_case=True, repeat=1
+                    )
+                    seconds = measure_unittest_collection(test_case)
+                    yield {**base, "benchmark": "unittest_collection", "seconds": seconds}
+                    seconds = measure_call_overhead(test_case)
+                    yield {**base, "benchmark": "call_overhead", "seconds": seconds}
+                    del sys.modules[test_case.__name__], test_case
+
+                if with_pytest:
+                    seconds = measure_pytest_collection(directory, module.__name__)
+                    yield {**base, "benchmark": "pytest_collection", "seconds": seconds}
+
+                del sys.modules[module.__name__], module
+        finally:
+            sys.path.remove(temp_dir)
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float):
+    """
+    Prints differences with baseline results and returns number of regressions
+    """
+
+    def key(result):
+        return result["benchmark"], result["implementation"], result["cases"], result["depth"]
+
+    metrics = ("seconds", "peak_bytes", "retained_bytes")
+    previous = {key(result): result for result in baseline}
+    regressions = 0
+    for result in results:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        for metric in metrics:
+            if not result.get(metric) or not old.get(metric):
+                continue
+            ratio = result[metric] / old[metric]
+            regressed = ratio > 1 + tolerance
+            regressions += regressed
+            marker = " REGRESSION" if regressed else ""
+            print(f"{' '.join(map(str, key(result)))} {metric}: {ratio:.2f}x{marker}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", type=int, nargs="+", default=DEFAULT_CASES)
+    parser.add_argument("--depths", type=int, nargs="+", default=DEFAULT_DEPTHS)
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="JSON results to compare with")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed slowdown, 0.2 means 20%%"
+    )
+    parser.add_argument("--no-pytest", action="store_true", help="skip pytest measurements")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(ROOT))
+    with_pytest = not args.no_pytest and importlib.util.find_spec("pytest") is not None
+    results = []
+    for result in run(args.cases, args.depths, with_pytest):
+        print(json.dumps(result), file=sys.stderr)
+        results.append(result)
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
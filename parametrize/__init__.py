@@ -1,8 +1,14 @@
-from .parametrize import parametrize
+from .parametrize import param, parametrize
+from .sources import from_array, from_file
+from .values import lazy
 
 
 __version__ = "0.0.0"
 
 __all__ = [
+    "from_array",
+    "from_file",
+    "lazy",
+    "param",
     "parametrize",
 ]
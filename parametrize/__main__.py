@@ -0,0 +1,86 @@
+"""
+python -m parametrize [run] [tests ...] [options]
+python -m parametrize compile [paths ...] [-o manifest]
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from parametrize import manifest, runner
+
+
+COMMANDS = ("run", "compile")
+DEFAULT_COMMAND = "run"
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m parametrize")
+    commands = parser.add_subparsers(dest="command")
+
+    run = commands.add_parser("run", help="run unittest tests in a pool of processes")
+    run.add_argument(
+        "tests",
+        nargs="*",
+        help="names of tests to run, e.g. module.TestCase.test_method, all discovered by default",
+    )
+    run.add_argument("-s", "--start-directory", default=".", help="directory to start discovery")
+    run.add_argument("-p", "--pattern", default="test*.py", help="pattern of test files")
+    run.add_argument("-t", "--top-level-directory", help="top level directory of the project")
+    run.add_argument(
+        "-j", "--workers", type=int, help="number of processes, number of CPUs by default"
+    )
+    run.add_argument("-v", "--verbose", dest="verbosity", action="store_const", const=2, default=1)
+    run.add_argument("-q", "--quiet", dest="verbosity", action="store_const", const=0)
+    run.add_argument("-b", "--buffer", action="store_true", help="buffer output of tests")
+    run.add_argument("--junit-xml", help="write results as JUnit XML to this file")
+    run.add_argument("--durations", help="merge durations of tests into this JSON file")
+
+    compile_ = commands.add_parser(
+        "compile", help="precompute parametrization of tests into a manifest"
+    )
+    compile_.add_argument(
+        "paths", nargs="*", help="test files, modules or directories, current directory by default"
+    )
+    compile_.add_argument("-p", "--pattern", default="test*.py", help="pattern of test files")
+    compile_.add_argument(
+        "-o", "--output", default=manifest.DEFAULT_PATH, help="path of the manifest to write"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = [DEFAULT_COMMAND, *argv]
+    args = make_parser().parse_args(argv)
+
+    if args.command == "compile":
+        return compile_manifest(args)
+
+    result = runner.run(
+        runner.Discovery(
+            tuple(args.tests), args.start_directory, args.pattern, args.top_level_directory
+        ),
+        workers=args.workers,
+        verbosity=args.verbosity,
+        buffer=args.buffer,
+        junit_xml=args.junit_xml,
+        durations=args.durations,
+    )
+    return 0 if result.wasSuccessful() else 1
+
+
+def compile_manifest(args: argparse.Namespace) -> int:
+    try:
+        compiled = manifest.compile_manifest(args.paths, args.output, args.pattern)
+    except ImportError as error:
+        print(error, file=sys.stderr)
+        return 1
+    functions = sum(len(entry["functions"]) for entry in compiled.files.values())
+    print(f"Compiled {functions} parametrized function(s) of {len(compiled.files)} file(s)")
+    print(f"Set {manifest.MANIFEST_ENV_VAR}={args.output} to use it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
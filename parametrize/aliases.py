@@ -0,0 +1,128 @@
+import os
+import sys
+import sysconfig
+from collections import OrderedDict
+from itertools import islice
+from types import ModuleType
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Set, Tuple
+
+
+def _get_site_paths() -> Tuple[str, ...]:
+    paths = sysconfig.get_paths()
+    return tuple(
+        {
+            os.path.join(paths[key], "")
+            for key in ("stdlib", "platstdlib", "purelib", "platlib")
+            if key in paths
+        }
+    )
+
+
+def _is_module_namespace(namespace: Mapping[str, Any]) -> bool:
+    name = namespace.get("__name__")
+    module = sys.modules.get(name) if isinstance(name, str) else None
+    return getattr(module, "__dict__", None) is namespace
+
+
+class _ScannedNamespace:
+    __slots__ = ("namespace", "scanned", "aliases", "modules")
+
+    def __init__(self, namespace: Dict[str, Any]):
+        self.namespace = namespace
+        self.scanned = 0
+        self.aliases: Set[str] = set()
+        self.modules: Set[str] = set()
+
+
+class AliasResolver:
+    """
+    Finds names under which parametrize decorators are available in a namespace
+
+    Results are remembered per module namespace, so each next lookup only checks names added since
+    the previous one. Modules of standard library and installed packages are scanned only once.
+    Other namespaces, e.g. class bodies, are scanned on each lookup and never kept.
+    """
+
+    def __init__(self, is_alias: Callable[[Any], bool], max_namespaces: int = 256):
+        self.is_alias = is_alias
+        self.max_namespaces = max_namespaces
+        self._namespaces: "OrderedDict[int, _ScannedNamespace]" = OrderedDict()
+        self._frozen_modules: Dict[str, Tuple[ModuleType, FrozenSet[str]]] = {}
+        self._site_paths = _get_site_paths()
+
+    def find(self, namespace: Mapping[str, Any], search_in_modules: bool = True) -> Set[str]:
+        if not search_in_modules and namespace.get("__name__") in sys.builtin_module_names:
+            # don't search in builtin modules
+            return set()
+
+        scanned = self._scan(namespace)
+        # names could be rebound or deleted since they were scanned
+        aliases = {name for name in scanned.aliases if self.is_alias(namespace.get(name))}
+
+        if search_in_modules:
+            for name in scanned.modules:
+                module = namespace.get(name)
+                if isinstance(module, ModuleType):
+                    # allow usages like @my_module.my_predefined_params
+                    aliases.update(self._find_in_module(module))
+
+        return aliases
+
+    def clear(self):
+        self._namespaces.clear()
+        self._frozen_modules.clear()
+
+    def _scan(self, namespace: Mapping[str, Any]) -> _ScannedNamespace:
+        if type(namespace) is not dict or not _is_module_namespace(namespace):
+            # frame locals proxy is new on every access, class bodies and function locals
+            # hold every generated case, so only namespaces of modules are remembered
+            scanned = _ScannedNamespace(namespace)  # type: ignore[arg-type]
+            self._scan_items(scanned, namespace.items())
+            return scanned
+
+        key = id(namespace)
+        scanned = self._namespaces.get(key)  # type: ignore[assignment]
+        if (
+            scanned is None
+            or scanned.namespace is not namespace
+            or len(namespace) < scanned.scanned  # some names were deleted, positions shifted
+        ):
+            scanned = _ScannedNamespace(namespace)  # type: ignore[arg-type]
+            self._namespaces[key] = scanned
+            if len(self._namespaces) > self.max_namespaces:
+                self._namespaces.popitem(last=False)
+        else:
+            self._namespaces.move_to_end(key)
+
+        # dicts preserve insertion order, so only names added after the last scan are checked
+        self._scan_items(scanned, islice(namespace.items(), scanned.scanned, None))
+        scanned.scanned = len(namespace)
+        return scanned
+
+    def _scan_items(self, scanned: _ScannedNamespace, items):
+        for key, value in items:
+            if self.is_alias(value):
+                scanned.aliases.add(key)
+            elif isinstance(value, ModuleType):
+                scanned.modules.add(key)
+
+    def _find_in_module(self, module: ModuleType) -> FrozenSet[str]:
+        if not self._is_frozen(module):
+            return frozenset(self.find(module.__dict__, search_in_modules=False))
+
+        cached = self._frozen_modules.get(module.__name__)
+        if cached is None or cached[0] is not module:
+            aliases = frozenset(
+                key for key, value in list(module.__dict__.items()) if self.is_alias(value)
+            )
+            cached = self._frozen_modules[module.__name__] = module, aliases
+        return cached[1]
+
+    def _is_frozen(self, module: ModuleType) -> bool:
+        """
+        Builtin modules, standard library and installed packages aren't expected to change
+        """
+        if module.__name__ in sys.builtin_module_names:
+            return True
+        filename = getattr(module, "__file__", None)
+        return isinstance(filename, str) and filename.startswith(self._site_paths)
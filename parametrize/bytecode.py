@@ -0,0 +1,133 @@
+import dis
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from types import CodeType, FrameType
+from typing import Any, List, Optional, Tuple
+
+
+# since python 3.11 every instruction knows exact position of the expression it belongs to,
+# so decorator application can be matched with the expression that loaded the decorator
+SUPPORTED = sys.version_info >= (3, 11)
+
+Decorator = Tuple[str, Any]  # dotted name and the object it refers to
+
+_LOCALS, _GLOBALS, _BUILTINS = "locals", "globals", "builtins"
+_HEAD_LOADS = {
+    "LOAD_NAME": (_LOCALS, _GLOBALS, _BUILTINS),
+    "LOAD_GLOBAL": (_GLOBALS, _BUILTINS),
+    "LOAD_FROM_DICT_OR_GLOBALS": (_LOCALS, _GLOBALS, _BUILTINS),
+    "LOAD_FAST": (_LOCALS,),
+    "LOAD_FAST_CHECK": (_LOCALS,),
+    "LOAD_DEREF": (_LOCALS,),
+    "LOAD_CLASSDEREF": (_LOCALS,),
+    "LOAD_FROM_DICT_OR_DEREF": (_LOCALS,),
+}
+_ATTRIBUTE_LOADS = {"LOAD_ATTR", "LOAD_METHOD"}
+_FUNCTION_MAKERS = {"MAKE_FUNCTION", "SET_FUNCTION_ATTRIBUTE"}
+_STORES = {"STORE_NAME", "STORE_GLOBAL", "STORE_FAST", "STORE_DEREF"}
+_MISSING = object()
+
+
+def get_stacked_decorators(frame: FrameType) -> Optional[List[Decorator]]:
+    """
+    Returns all decorators of the function being decorated in the given frame
+
+    Decorators are listed in order of application (from the bottom to the top).
+    None is returned when decorators can't be figured out from the bytecode
+    (e.g. when the decorator is called as a regular function).
+    """
+    if not SUPPORTED:
+        return None
+
+    offsets, instructions = _get_instructions(frame.f_code)
+    current = bisect_right(offsets, frame.f_lasti) - 1  # f_lasti may point to inline cache
+    if current < 0 or not _is_application(instructions[current]):
+        return None
+
+    maker = current - 1
+    while maker >= 0 and _is_application(instructions[maker], allow_precall=True):
+        maker -= 1
+    if maker < 0 or instructions[maker].opname not in _FUNCTION_MAKERS:
+        return None
+
+    applications = []
+    first_application = maker + 1
+    for instruction in instructions[first_application:]:
+        if instruction.opname in _STORES:
+            break
+        if not _is_application(instruction, allow_precall=True):
+            return None
+        if instruction.opname == "CALL":
+            applications.append(instruction)
+    else:
+        return None
+
+    namespaces = {
+        _LOCALS: frame.f_locals,
+        _GLOBALS: frame.f_globals,
+        _BUILTINS: frame.f_builtins,
+    }
+    decorators = []
+    for application in applications:
+        decorator = _find_decorator(instructions, maker, application, namespaces)
+        if decorator is None:
+            return None
+        decorators.append(decorator)
+
+    return decorators
+
+
+@lru_cache(maxsize=64)
+def _get_instructions(code: CodeType) -> Tuple[List[int], List[dis.Instruction]]:
+    instructions = list(dis.get_instructions(code))
+    return [instruction.offset for instruction in instructions], instructions
+
+
+def _is_application(instruction: dis.Instruction, allow_precall: bool = False) -> bool:
+    if instruction.opname == "PRECALL":
+        return allow_precall and instruction.arg == 0
+    return instruction.opname == "CALL" and instruction.arg == 0
+
+
+def _find_decorator(instructions, maker, application, namespaces) -> Optional[Decorator]:
+    position = application.positions
+    for head_index in range(maker - 1, -1, -1):
+        head = instructions[head_index]
+        if (
+            head.opname in _HEAD_LOADS
+            and head.positions.lineno == position.lineno
+            and head.positions.col_offset == position.col_offset
+        ):
+            break
+    else:
+        return None
+
+    attributes = []
+    first_attribute = head_index + 1
+    for instruction in instructions[first_attribute:maker]:
+        if instruction.opname == "PUSH_NULL":
+            continue
+        if (
+            instruction.opname not in _ATTRIBUTE_LOADS
+            or instruction.positions.lineno != position.lineno
+            or instruction.positions.col_offset != position.col_offset
+        ):
+            break
+        attributes.append(instruction.argval)
+
+    value = _MISSING
+    for scope in _HEAD_LOADS[head.opname]:
+        value = namespaces[scope].get(head.argval, _MISSING)
+        if value is not _MISSING:
+            break
+    else:
+        return None
+
+    try:
+        for attribute in attributes:
+            value = getattr(value, attribute)
+    except Exception:
+        return None
+
+    return ".".join([head.argval, *attributes]), value
@@ -0,0 +1,364 @@
+"""
+Results of cases that passed before, so they can be skipped while nothing they depend on changes
+
+A case is identified by a digest of the code of its function, code of functions it calls by name,
+immutable values of its closure, names of its arguments and its parameter values.
+Source files of first-party modules loaded when it passed are stored with it, and it's skipped
+only while none of them changes, so changes to the code under test are seen too.
+Modules of the standard library and of installed packages are not hashed,
+neither are other test modules, unless the module of the test refers to them.
+Passed cases are appended to a local file, each with a single write,
+so processes running tests at the same time don't corrupt it.
+"""
+import contextlib
+import enum
+import hashlib
+import inspect
+import json
+import os
+import site
+import sys
+import sysconfig
+import threading
+from types import CodeType, FunctionType, ModuleType
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, Union
+
+
+CACHE_ENV_VAR = "PARAMETRIZE_CACHE"
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+_DIGEST_SIZE = 16
+_SCALARS = (bool, int, float, complex, str, bytes, enum.Enum)
+
+
+class ResultCache:
+    """
+    Keys of passed cases, stored in a file line by line with the source files they depended on
+
+    Each set of files is stored once, as "files <id> <json list of paths>",
+    and each case as "case <key> <id of files> <digest of files when it passed>".
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = os.fspath(path)
+        self._cases: Optional[Dict[str, Tuple[str, str]]] = None
+        self._files: Dict[str, Tuple[str, ...]] = {}
+        self._digests: Dict[str, str] = {}  # digests of sets of files by their ids, once per run
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Whether the case passed before, and none of the files it depended on changed since
+        """
+        entry = self._load().get(key)
+        if entry is None:
+            return False
+        files_id, digest = entry
+        return files_id in self._files and self._get_digest(files_id) == digest
+
+    def add(self, key: str, files: Iterable[str] = ()):
+        files = tuple(sorted(set(files)))
+        files_id = _files_id(files)
+        with self._lock:
+            cases = self._load()
+            known = files_id in self._files
+            self._files[files_id] = files
+            entry = files_id, self._get_digest(files_id)
+            if cases.get(key) == entry:
+                return
+            cases[key] = entry
+            lines = [] if known else [f"files {files_id} {json.dumps(files)}"]
+            lines.append(f"case {key} {' '.join(entry)}")
+            # appending with a single write is atomic on POSIX, files are written before the case
+            descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(descriptor, "".join(f"{line}\n" for line in lines).encode())
+            finally:
+                os.close(descriptor)
+
+    def clear(self):
+        with self._lock:
+            self._cases = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _get_digest(self, files_id: str) -> str:
+        digest = self._digests.get(files_id)
+        if digest is None:
+            digest = self._digests[files_id] = files_digest(self._files[files_id])
+        return digest
+
+    def _load(self) -> Dict[str, Tuple[str, str]]:
+        if self._cases is None:
+            self._cases = {}
+            try:
+                with open(self.path) as file:
+                    lines = file.read().splitlines()
+            except FileNotFoundError:
+                lines = []
+            # last line may be incomplete if a writer was interrupted, it never matches
+            for line in lines:
+                kind, _, rest = line.partition(" ")
+                if kind == "case" and rest.count(" ") == 2:
+                    key, files_id, digest = rest.split(" ")
+                    self._cases[key] = files_id, digest
+                elif kind == "files":
+                    files_id, _, paths = rest.partition(" ")
+                    with contextlib.suppress(ValueError):
+                        files = tuple(json.loads(paths))
+                        if _files_id(files) == files_id:
+                            self._files[files_id] = files
+        return self._cases
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r})"
+
+
+_configured: Optional[ResultCache] = None
+_from_env: Tuple[Optional[str], Optional[ResultCache]] = (None, None)
+
+
+def configure(path: Optional[PathLike]):
+    """
+    Skip cases that passed before with the same code and values, results are stored at path
+
+    Pass None to fall back to PARAMETRIZE_CACHE environment variable.
+    Only affects cases generated after it's called.
+    """
+    global _configured
+    _configured = ResultCache(path) if path is not None else None
+
+
+def get_cache() -> Optional[ResultCache]:
+    """
+    Returns configured cache or the one set by environment variable, None if disabled
+    """
+    global _from_env
+    if _configured is not None:
+        return _configured
+
+    path = os.environ.get(CACHE_ENV_VAR) or None
+    if _from_env[0] != path:
+        _from_env = path, ResultCache(path) if path else None
+    return _from_env[1]
+
+
+def function_digest(func: Any) -> Optional[str]:
+    """
+    Digest of the code of the function, of the functions it refers to by global names,
+    and of functions and immutable values of its closure
+
+    Functions referred to are only followed one level deep. None if function has no code.
+    """
+    func = inspect.unwrap(func)
+    code = getattr(func, "__code__", None)
+    if not isinstance(code, CodeType):
+        return None
+
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    _update_with_code(digest, code)
+    namespace = getattr(func, "__globals__", {})
+    for name in sorted(set(_global_names(code))):
+        dependency = namespace.get(name)
+        if isinstance(dependency, FunctionType) and dependency is not func:
+            digest.update(name.encode())
+            _update_with_code(digest, dependency.__code__)
+    for cell in func.__closure__ or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:  # not assigned yet
+            continue
+        if isinstance(value, FunctionType):
+            _update_with_code(digest, value.__code__)
+        elif _is_immutable(value):
+            _update_with_value(digest, value)
+    return digest.hexdigest()
+
+
+_third_party_directories: Optional[Tuple[str, ...]] = None
+_loaded: Tuple[Optional[int], Dict[str, str]] = (None, {})  # first-party files of loaded modules
+_dependencies: Dict[str, Tuple[int, Tuple[str, ...]]] = {}  # files by names of test modules
+_file_digests: Dict[str, Tuple[Tuple[int, int], bytes]] = {}  # by path, with mtime and size
+
+
+def loaded_files(func: Any) -> Tuple[str, ...]:
+    """
+    Source files of first-party modules loaded now, the function may depend on any of them
+
+    Modules from the standard library and from site-packages are left out,
+    as well as modules without files, and test modules other than the one of the function,
+    unless it refers to them. Loaded modules are only looked at again when more are loaded.
+    """
+    global _loaded
+    count = len(sys.modules)
+    if _loaded[0] != count:
+        files = ((name, _first_party_file(module)) for name, module in list(sys.modules.items()))
+        _loaded = count, {name: path for name, path in files if path is not None}
+
+    own = getattr(func, "__module__", None) or ""
+    cached = _dependencies.get(own)
+    if cached is not None and cached[0] == count:
+        return cached[1]
+    referred = _referred_modules(sys.modules.get(own))
+    dependencies = tuple(
+        sorted(
+            {
+                path
+                for name, path in _loaded[1].items()
+                if name == own or name in referred or not _is_test_module(name)
+            }
+        )
+    )
+    _dependencies[own] = count, dependencies
+    return dependencies
+
+
+def files_digest(paths: Iterable[str]) -> str:
+    """
+    Digest of the paths and contents of the files, missing ones included
+    """
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    for path in sorted(paths):
+        digest.update(path.encode(errors="surrogatepass"))
+        digest.update(_file_digest(path))
+    return digest.hexdigest()
+
+
+def _files_id(paths: Tuple[str, ...]) -> str:
+    return hashlib.blake2b(json.dumps(paths).encode(), digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def _is_test_module(name: str) -> bool:
+    # same as default patterns of unittest and pytest: test*.py and *_test.py
+    basename = name.rpartition(".")[2]
+    return basename.startswith("test") or basename.endswith("_test")
+
+
+def _referred_modules(module: Optional[ModuleType]) -> Set[str]:
+    names: Set[str] = set()
+    if module is None:
+        return names
+    for value in list(vars(module).values()):
+        if isinstance(value, ModuleType):
+            names.add(value.__name__)
+            continue
+        try:
+            name = getattr(value, "__module__", None)
+        except Exception:  # proxies may fail on any attribute
+            continue
+        if isinstance(name, str):
+            names.add(name)
+    return names
+
+
+def _first_party_file(module: Any) -> Optional[str]:
+    path = getattr(module, "__file__", None)
+    if not isinstance(path, str):
+        return None
+    path = os.path.realpath(path)
+    if path.startswith(_get_third_party_directories()):
+        return None
+    return path
+
+
+def _get_third_party_directories() -> Tuple[str, ...]:
+    global _third_party_directories
+    if _third_party_directories is None:
+        paths = sysconfig.get_paths()
+        directories = [paths[name] for name in ("stdlib", "platstdlib", "purelib", "platlib")]
+        with contextlib.suppress(AttributeError):  # site of virtualenv may lack these
+            directories.extend(site.getsitepackages())
+            directories.append(site.getusersitepackages())
+        _third_party_directories = tuple(
+            os.path.join(os.path.realpath(directory), "") for directory in directories
+        )
+    return _third_party_directories
+
+
+def _file_digest(path: str) -> bytes:
+    try:
+        stat = os.stat(path)
+        version = stat.st_mtime_ns, stat.st_size
+        cached = _file_digests.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with open(path, "rb") as file:
+            digest = hashlib.blake2b(file.read(), digest_size=_DIGEST_SIZE).digest()
+    except OSError:
+        return b"missing"
+    _file_digests[path] = version, digest
+    return digest
+
+
+def case_key(function: str, argnames: Iterable[str], values: Iterable[Any]) -> Optional[str]:
+    """
+    Key of the case, None if some of its values can't be hashed stably across runs
+    """
+    digest = hashlib.blake2b(function.encode(), digest_size=_DIGEST_SIZE)
+    for argname, value in zip(argnames, values):
+        digest.update(argname.encode())
+        if not _update_with_value(digest, value):
+            return None
+    return digest.hexdigest()
+
+
+def passed(args: Tuple[Any, ...]) -> bool:
+    """
+    Whether nothing was reported as failed by the test, e.g. its subtests
+    """
+    outcome = getattr(args[0], "_outcome", None) if args else None
+    return getattr(outcome, "success", True)
+
+
+def _update_with_code(digest, code: CodeType):
+    # file name and line numbers are left out, so moving the function around keeps the cache
+    for attribute in (code.co_argcount, code.co_kwonlyargcount, code.co_flags):
+        digest.update(attribute.to_bytes(8, "little"))
+    digest.update(code.co_code)
+    for names in (code.co_names, code.co_varnames, code.co_freevars, code.co_cellvars):
+        digest.update("\0".join(names).encode())
+        digest.update(b"\1")
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _update_with_code(digest, const)
+        else:
+            digest.update(repr(const).encode(errors="surrogatepass"))
+        digest.update(b"\2")
+
+
+def _global_names(code: CodeType) -> Iterable[str]:
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _global_names(const)
+
+
+def _is_immutable(value: Any) -> bool:
+    if isinstance(value, tuple):
+        return all(map(_is_immutable, value))
+    return value is None or isinstance(value, _SCALARS)
+
+
+def _update_with_value(digest, value: Any) -> bool:
+    digest.update(type(value).__qualname__.encode())
+    if value is None or isinstance(value, _SCALARS):
+        digest.update(repr(value).encode(errors="surrogatepass"))
+        return True
+    if isinstance(value, (tuple, list)):
+        digest.update(len(value).to_bytes(8, "little"))
+        return all(_update_with_value(digest, item) for item in value)
+    if isinstance(value, dict):
+        digest.update(len(value).to_bytes(8, "little"))
+        return all(
+            _update_with_value(digest, key) and _update_with_value(digest, item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (set, frozenset)):
+        digest.update(len(value).to_bytes(8, "little"))
+        try:
+            items = sorted(value)
+        except TypeError:
+            return False
+        return all(_update_with_value(digest, item) for item in items)
+    return False  # repr of other objects may differ between runs, or not reflect their state
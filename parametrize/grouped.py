@@ -0,0 +1,194 @@
+"""
+Runs all cases of a parametrized function within a single test
+
+Each case is still reported on its own: as a subtest within unittest.TestCase,
+or as a part of CasesFailed error elsewhere.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import FunctionType
+from typing import Any, Callable, Optional, Sequence, Tuple
+from unittest import SkipTest, TestCase
+
+from parametrize import instrumentation
+
+
+Case = Tuple[int, str]  # index and id of the case
+
+
+class CasesFailed(AssertionError):
+    """
+    Raised outside of unittest.TestCase when some of the cases failed
+    """
+
+    def __init__(self, failures: Sequence[Tuple[str, BaseException]]):
+        self.failures = list(failures)
+        lines = [f"{len(self.failures)} case(s) failed:"]
+        lines.extend(f"[{case_id}] {error!r}" for case_id, error in self.failures)
+        super().__init__("\n".join(lines))
+
+
+def is_grouped(context) -> bool:
+    """
+    Whether all cases should be run by a single test
+    """
+    return bool(context.get_option("subtests")) or any(
+        context.get_option(option) is not None for option in ("concurrency", "workers")
+    )
+
+
+def make_grouped_method(context, cases: Sequence[Case]) -> FunctionType:
+    concurrency = context.get_option("concurrency")
+    workers = context.get_option("workers")
+    if concurrency is not None and workers is not None:
+        raise TypeError("Either concurrency or workers can be given, not both")
+    if concurrency is not None:
+        return make_concurrent_method(context, cases, concurrency)
+    if workers is not None:
+        return make_threaded_method(context, cases, workers)
+    return make_sequential_method(context, cases)
+
+
+def make_sequential_method(context, cases: Sequence[Case]) -> FunctionType:
+    """
+    Function running all the cases one after another, each of them within its own subtest
+    """
+    if context.is_coroutine:
+        return make_concurrent_method(context, cases, 1)
+
+    def run_sequentially(*args, **kwargs):
+        test = args[0] if args else None
+        if not isinstance(test, TestCase):
+            report(test, cases, [_run_case(context, case, args, kwargs) for case in cases])
+            return
+
+        for case in cases:
+            with test.subTest(case[1]):
+                reason = context.get_skip_reason(case[0])
+                if reason is not None:
+                    raise SkipTest(reason)
+                _call_case(context, case, args, kwargs)
+
+    return _as_test(context, run_sequentially)
+
+
+def make_concurrent_method(context, cases: Sequence[Case], concurrency: int) -> FunctionType:
+    """
+    Coroutine function running all the cases concurrently, at most concurrency of them at a time
+
+    Outcomes are reported only after all cases finished, in the order of cases.
+    """
+    if not context.is_coroutine:
+        raise TypeError(
+            f"concurrency can only be used with async functions, got {context.func.__qualname__}"
+        )
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be a positive number, got {concurrency}")
+
+    async def run_concurrently(*args, **kwargs):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_case(case: Case) -> Optional[BaseException]:
+            reason = context.get_skip_reason(case[0])
+            if reason is not None:
+                return SkipTest(reason)
+            async with semaphore:
+                try:
+                    await _call_case(context, case, args, kwargs)
+                except Exception as error:
+                    return error
+            return None
+
+        outcomes = await asyncio.gather(*map(run_case, cases))
+        report(args[0] if args else None, cases, outcomes)
+
+    return _as_test(context, run_concurrently)
+
+
+def make_threaded_method(context, cases: Sequence[Case], workers: int) -> FunctionType:
+    """
+    Function running all the cases in a pool of threads, at most workers of them at a time
+
+    The cases share the test and everything it set up, so they must not change any shared state.
+    Outcomes are reported only after all cases finished, in the order of cases,
+    since unittest results must only be updated from the thread running the test.
+    """
+    if context.is_coroutine:
+        raise TypeError(
+            f"workers can't be used with async functions, use concurrency instead, "
+            f"got {context.func.__qualname__}"
+        )
+    if workers < 1:
+        raise ValueError(f"workers must be a positive number, got {workers}")
+
+    def run_in_threads(*args, **kwargs):
+        with ThreadPoolExecutor(min(workers, len(cases)) or 1) as executor:
+            outcomes = list(
+                executor.map(lambda case: _run_case(context, case, args, kwargs), cases)
+            )
+        report(args[0] if args else None, cases, outcomes)
+
+    return _as_test(context, run_in_threads)
+
+
+def report(test: Any, cases: Sequence[Case], outcomes: Sequence[Optional[BaseException]]):
+    """
+    Reports outcome of each case after all of them finished
+    """
+    if isinstance(test, TestCase):
+        for (_, case_id), error in zip(cases, outcomes):
+            with test.subTest(case_id):
+                if error is not None:
+                    raise error
+        return
+
+    failures = [
+        (case_id, error)
+        for (_, case_id), error in zip(cases, outcomes)
+        if error is not None and not isinstance(error, SkipTest)
+    ]
+    if failures:
+        raise CasesFailed(failures) from failures[0][1]
+
+
+def _run_case(context, case: Case, args, kwargs) -> Optional[BaseException]:
+    reason = context.get_skip_reason(case[0])
+    if reason is not None:
+        return SkipTest(reason)
+    try:
+        _call_case(context, case, args, kwargs)
+    except Exception as error:
+        return error
+    return None
+
+
+def _call_case(context, case: Case, args, kwargs) -> Any:
+    index, case_id = case
+    arguments = {**context.get_case_arguments(index), **kwargs}
+    recorder = instrumentation.active
+    if recorder is None or not recorder.case_timing:
+        return context.func(*args, **arguments)
+
+    name = context.get_case_full_name(f"{context.func.__name__}[{case_id}]")
+    if context.is_coroutine:
+        return recorder.await_case(name, context.func, *args, **arguments)
+    return recorder.call_case(name, context.func, *args, **arguments)
+
+
+def _as_test(context, runner: Callable) -> Any:
+    func = context.func
+    runner.__name__ = func.__name__
+    runner.__qualname__ = func.__qualname__
+    runner.__module__ = func.__module__
+    runner.__doc__ = func.__doc__
+    # other arguments of the function are still passed to it, e.g. pytest fixtures
+    parametrized = set(context.case_argnames)
+    signature = context.signature
+    runner.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=[p for name, p in signature.parameters.items() if name not in parametrized]
+    )
+    # marks of decorators applied before parametrize, e.g. unittest.expectedFailure or pytest.mark
+    for name, value in vars(func).items():
+        if name != "__wrapped__":
+            setattr(runner, name, value)
+    return runner
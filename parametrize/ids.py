@@ -0,0 +1,144 @@
+import enum
+import hashlib
+import re
+from numbers import Number
+from types import BuiltinFunctionType, FunctionType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from parametrize.values import lazy
+
+
+IdsOption = Union[Sequence[Optional[str]], Callable[[Any], Optional[str]], None]
+
+MAX_ID_LENGTH = 64
+# containers are stringified only if they are small, otherwise str() alone may take ages
+MAX_CONTAINER_ITEMS = 16
+
+_HASH_LENGTH = 8
+_CONTAINERS = (list, tuple, set, frozenset, dict)
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+>")
+
+
+def make_ids(
+    argnames: Sequence[str], rows: Sequence[Sequence[Any]], ids: IdsOption, start: int = 0
+) -> List[str]:
+    """
+    Returns id for each row of values of a single parametrize decorator
+
+    ids may be a sequence with an id (or None) for each row,
+    or a callable returning an id (or None) for each value, same as in pytest.
+    start is the index of the first given row, rows can be passed in chunks.
+    Rows without an id in a sequence get default ids, use check_ids_count() when all rows are seen.
+    """
+    if ids is None or callable(ids):
+        return [
+            "-".join(
+                _format_with(ids, value, argname, index)
+                for argname, value in zip(argnames, values)
+            )
+            for index, values in enumerate(rows, start)
+        ]
+
+    stop = start + len(rows)
+    given: List[Optional[str]] = list(ids[start:stop])
+    given += [None] * (len(rows) - len(given))
+    return [
+        "-".join(format_id(value, argname, index) for argname, value in zip(argnames, values))
+        if id_ is None
+        else _bound(str(id_))
+        for index, (id_, values) in enumerate(zip(given, rows), start)
+    ]
+
+
+def normalize_ids(ids: IdsOption) -> IdsOption:
+    if ids is None or callable(ids):
+        return ids
+    if isinstance(ids, (str, bytes)):
+        raise TypeError(f"ids must be a sequence of ids or a callable, got {ids!r}")
+    return list(ids)
+
+
+def check_ids_count(ids: IdsOption, count: int):
+    if ids is None or callable(ids):
+        return
+    if len(ids) != count:
+        raise ValueError(
+            f"Wrong number of ids, expected {count} (one for each set of values), got {len(ids)}"
+        )
+
+
+def format_custom_id(id_: Any) -> str:
+    return _bound(str(id_))
+
+
+def format_id(value: Any, argname: str, index: int) -> str:
+    """
+    Default id of a single value, never longer than MAX_ID_LENGTH
+
+    Values without meaningful string representation get pytest-like "<argname><index>" ids
+    """
+    text: Optional[str]
+    try:
+        if isinstance(value, (str, bytes, Number, enum.Enum)) or value is None:
+            text = str(value)  # ints with too many digits can't be converted in python 3.11+
+        elif isinstance(value, (type, FunctionType, BuiltinFunctionType)):
+            text = getattr(value, "__name__", None)
+        elif isinstance(value, lazy):
+            text = value.name  # value itself is not built until the case runs
+        elif isinstance(value, _CONTAINERS) and len(value) > MAX_CONTAINER_ITEMS:
+            text = None
+        elif type(value).__repr__ is object.__repr__ and type(value).__str__ is object.__str__:
+            text = None  # default repr contains memory address, it's different on every run
+        else:
+            text = str(value)
+    except Exception:
+        text = None
+
+    if text is None or _ADDRESS.search(text):
+        return f"{argname}{index}"
+    return _bound(text)
+
+
+def _format_with(ids: Optional[Callable[[Any], Optional[str]]], value, argname, index) -> str:
+    if ids is not None:
+        id_ = ids(value)
+        if id_ is not None:
+            return _bound(str(id_))
+    return format_id(value, argname, index)
+
+
+def _bound(text: str) -> str:
+    text = text.replace(".", "-")
+    if len(text) <= MAX_ID_LENGTH:
+        return text
+    # hash of the whole text keeps truncated ids of different values different
+    digest = hashlib.blake2b(
+        text.encode(errors="surrogatepass"), digest_size=_HASH_LENGTH // 2
+    ).hexdigest()
+    return f"{text[: MAX_ID_LENGTH - _HASH_LENGTH - 1]}~{digest}"
+
+
+class UniqueIds:
+    """
+    Numbers repeated ids: a, a:1, a:2...
+
+    Each repeated id remembers its next number, so numbering doesn't depend on number of repeats
+    """
+
+    __slots__ = ("used", "next_numbers")
+
+    def __init__(self):
+        self.used: Set[str] = set()
+        self.next_numbers: Dict[str, int] = {}
+
+    def add(self, id_: str) -> str:
+        unique = id_
+        if unique in self.used:
+            number = self.next_numbers.get(id_, 1)
+            unique = f"{id_}:{number}"
+            while unique in self.used:  # only when ids like "a:1" are given explicitly
+                number += 1
+                unique = f"{id_}:{number}"
+            self.next_numbers[id_] = number + 1
+        self.used.add(unique)
+        return unique
@@ -0,0 +1,175 @@
+"""
+Opt-in measurements of parametrize itself and of parametrized cases
+
+Disabled by default, when disabled cases are called as usual, and steps of decoration
+are only checked for being measured.
+Set PARAMETRIZE_INSTRUMENT environment variable to a path to enable it before tests are imported,
+and to dump the report as JSON to that path when the process exits.
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional
+
+
+INSTRUMENT_ENV_VAR = "PARAMETRIZE_INSTRUMENT"
+SLOWEST_CASES = 20
+
+
+class Instrumentation:
+    """
+    Collected measurements: time of each step of decoration per module, number of generated cases
+    per function and, with case_timing=True, wall and CPU time of each case
+
+    CPU time of async cases includes time of other coroutines running at the same time.
+    """
+
+    def __init__(self, case_timing: bool = True):
+        self.case_timing = case_timing
+        self.steps: Dict[str, Dict[str, float]] = {}  # calls and seconds of each step
+        self.modules: Dict[str, float] = {}  # seconds spent decorating functions of each module
+        self.functions: Dict[str, int] = {}  # number of cases generated for each function
+        self.cases: Dict[str, Dict[str, float]] = {}  # runs, wall and CPU seconds of each case
+        self._lock = threading.Lock()  # cases may run in threads
+
+    @contextmanager
+    def step(self, name: str, module: Optional[str] = None) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                step = self.steps.setdefault(name, {"calls": 0, "seconds": 0.0})
+                step["calls"] += 1
+                step["seconds"] += elapsed
+                if module is not None:
+                    self.modules[module] = self.modules.get(module, 0.0) + elapsed
+
+    def count_cases(self, function_name: str, count: int):
+        with self._lock:
+            self.functions[function_name] = self.functions.get(function_name, 0) + count
+
+    def add_case_time(self, name: str, wall: float, cpu: float):
+        with self._lock:
+            case = self.cases.setdefault(name, {"runs": 0, "wall": 0.0, "cpu": 0.0})
+            case["runs"] += 1
+            case["wall"] += wall
+            case["cpu"] += cpu
+
+    def call_case(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.add_case_time(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    async def await_case(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self.add_case_time(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def timed(self, func: Callable, name: str) -> Callable:
+        """
+        Wraps function of a single case, so each call of it is timed
+        """
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def timed_coroutine(*args, **kwargs):
+                return await self.await_case(name, func, *args, **kwargs)
+
+            return timed_coroutine
+
+        @functools.wraps(func)
+        def timed_function(*args, **kwargs):
+            return self.call_case(name, func, *args, **kwargs)
+
+        return timed_function
+
+    def report(self, slowest: int = SLOWEST_CASES) -> Dict[str, Any]:
+        with self._lock:
+            cases = {name: dict(case) for name, case in self.cases.items()}
+            report = {
+                "steps": {name: dict(step) for name, step in self.steps.items()},
+                "modules": dict(self.modules),
+                "functions": dict(self.functions),
+                "cases": cases,
+            }
+        ranking = sorted(cases.items(), key=lambda item: item[1]["wall"], reverse=True)
+        report["slowest_cases"] = [dict(case, name=name) for name, case in ranking[:slowest]]
+        return report
+
+
+active: Optional[Instrumentation] = None
+
+
+def enable(case_timing: bool = True) -> Instrumentation:
+    """
+    Starts collecting measurements, cases are timed only if enabled before they are generated
+    """
+    global active
+    active = Instrumentation(case_timing)
+    return active
+
+
+def disable():
+    global active
+    active = None
+
+
+class _NotMeasured:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NOT_MEASURED = _NotMeasured()
+
+
+def step(name: str, module: Optional[str] = None) -> ContextManager[None]:
+    """
+    Measures time of a step of decoration, module is the one whose function is decorated
+    """
+    if active is None:
+        return _NOT_MEASURED
+    return active.step(name, module)
+
+
+def count_cases(function_name: str, count: int):
+    if active is not None:
+        active.count_cases(function_name, count)
+
+
+def dump(path: str, slowest: int = SLOWEST_CASES):
+    """
+    Writes the report as JSON, with slowest_cases summary sorted by wall time
+    """
+    if active is None:
+        raise RuntimeError("Instrumentation is not enabled")
+    with open(path, "w") as file:
+        json.dump(active.report(slowest), file, indent=2)
+
+
+def _enable_from_env():
+    path = os.environ.get(INSTRUMENT_ENV_VAR)
+    if path and active is None:
+        enable()
+        atexit.register(_dump_at_exit, path, os.getpid())
+
+
+def _dump_at_exit(path: str, pid: int):
+    if active is not None and os.getpid() == pid:  # forked processes don't overwrite the report
+        dump(path)
+
+
+_enable_from_env()
@@ -0,0 +1,163 @@
+"""
+Precomputed facts about parametrized functions, so they aren't figured out on every import
+
+python -m parametrize compile imports test modules once and records, for each parametrized
+function, number of its parametrize decorators. When PARAMETRIZE_MANIFEST points to the manifest,
+numbers of decorators are taken from it for every file that didn't change since, instead of
+scanning bytecode or source of the file. Nothing else is precomputed: argument names are cheap
+to read from code objects, and cases are derived from values on import,
+since values may come from other modules and data files.
+"""
+import hashlib
+import json
+import os
+import unittest
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+
+MANIFEST_ENV_VAR = "PARAMETRIZE_MANIFEST"
+DEFAULT_PATH = ".parametrize-manifest.json"
+VERSION = 1
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class Manifest:
+    __slots__ = ("path", "files", "_valid")
+
+    def __init__(self, path: PathLike, files: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = os.fspath(path)
+        self.files: Dict[str, Dict[str, Any]] = files if files is not None else {}
+        self._valid: Dict[str, Optional[Dict[str, Any]]] = {}  # functions of checked files
+
+    @classmethod
+    def load(cls, path: PathLike) -> "Manifest":
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return cls(path)
+        if data.get("version") != VERSION:
+            return cls(path)  # written by another version, it's recompiled from scratch
+        return cls(path, data["files"])
+
+    def save(self):
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump({"version": VERSION, "files": self.files}, file, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+    def get_function(self, filename: str, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Recorded facts about the function, None if unknown or its file changed since
+        """
+        if filename not in self._valid:
+            self._valid[filename] = self._check(filename)
+        functions = self._valid[filename]
+        return functions.get(key) if functions is not None else None
+
+    def record(self, filename: str, key: str, **facts: Any):
+        path = os.path.realpath(filename)
+        entry = self.files.get(path)
+        if entry is None:
+            entry = self.files[path] = {**_stat(path), "hash": _hash(path), "functions": {}}
+        entry["functions"].setdefault(key, {}).update(facts)
+
+    def _check(self, filename: str) -> Optional[Dict[str, Any]]:
+        path = os.path.realpath(filename)
+        entry = self.files.get(path)
+        if entry is None:
+            return None
+        try:
+            stat = _stat(path)
+            # modified files may still have the same content, e.g. after git checkout
+            if stat != {"mtime_ns": entry["mtime_ns"], "size": entry["size"]} and (
+                _hash(path) != entry["hash"]
+            ):
+                return None
+        except OSError:
+            return None
+        return entry["functions"]
+
+
+def function_key(func: Any) -> Tuple[str, str]:
+    """
+    File name and key of the function in it, functions redefined with the same name differ by line
+    """
+    code = func.__code__
+    return code.co_filename, f"{func.__qualname__}:{code.co_firstlineno}"
+
+
+_loaded: Tuple[Optional[str], Optional[Manifest]] = (None, None)
+recording: Optional[Manifest] = None  # manifest being compiled
+
+
+def get_manifest() -> Optional[Manifest]:
+    """
+    Returns manifest set by PARAMETRIZE_MANIFEST environment variable, None if not set
+    """
+    global _loaded
+    path = os.environ.get(MANIFEST_ENV_VAR) or None
+    if _loaded[0] != path:
+        _loaded = path, Manifest.load(path) if path else None
+    return _loaded[1]
+
+
+def get_decorators_count(func: Any) -> Optional[int]:
+    manifest = get_manifest()
+    if manifest is None or recording is not None or not hasattr(func, "__code__"):
+        return None
+    facts = manifest.get_function(*function_key(func))
+    return facts["decorators"] if facts is not None else None
+
+
+def record(func: Any, **facts: Any):
+    if recording is not None and hasattr(func, "__code__"):
+        recording.record(*function_key(func), **facts)
+
+
+def compile_manifest(paths: Sequence[str], output: PathLike = DEFAULT_PATH, pattern="test*.py"):
+    """
+    Imports test modules from given files and directories, and writes manifest of them
+
+    Raises ImportError if any of the modules failed to import, nothing is written then.
+    """
+    from parametrize.runner import Discovery, discover
+
+    global recording
+    manifest = recording = Manifest(output)
+    failed: List[str] = []
+    try:
+        for path in paths or ["."]:
+            if os.path.isdir(path):
+                tests = discover(Discovery(start=path, pattern=pattern))
+            else:
+                tests = discover(Discovery(names=(_module_name(path),)))
+            failed.extend(test.id() for test in tests if isinstance(test, _FailedTest))
+    finally:
+        recording = None
+
+    if failed:
+        raise ImportError(f"Failed to import: {', '.join(failed)}")
+    manifest.save()
+    return manifest
+
+
+_FailedTest = getattr(unittest.loader, "_FailedTest", ())  # stands for modules failed to import
+
+
+def _module_name(path: str) -> str:
+    if not path.endswith(".py"):
+        return path  # already a module name
+    relative = os.path.relpath(path)
+    return os.path.splitext(relative)[0].replace(os.sep, ".")
+
+
+def _stat(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _hash(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
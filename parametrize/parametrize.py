@@ -1,17 +1,75 @@
+import functools
 import inspect
 import itertools
-import sys
+import operator
+import os
+import re
 from contextlib import suppress
-from functools import partial, wraps
-from types import FrameType, FunctionType, ModuleType
-from typing import Any, Dict, Iterable, List, Set, Tuple, Union, cast
+from random import Random
+from types import FrameType, FunctionType, MethodType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+from unittest import SkipTest, TestCase
 
-from parametrize.utils import copy_func
+from parametrize import instrumentation, manifest
+from parametrize.aliases import AliasResolver
+from parametrize.bytecode import get_stacked_decorators
+from parametrize.cache import (
+    ResultCache,
+    case_key,
+    function_digest,
+    get_cache,
+    loaded_files,
+    passed,
+)
+from parametrize.grouped import is_grouped, make_grouped_method
+from parametrize.ids import (
+    IdsOption,
+    UniqueIds,
+    check_ids_count,
+    format_custom_id,
+    make_ids,
+    normalize_ids,
+)
+from parametrize.sampling import get_overrides, get_random, sample
+from parametrize.selection import get_selector
+from parametrize.sharding import get_shard
+from parametrize.source import get_decorator_lines
+from parametrize.sources import PositionIds, RowSource
+from parametrize.strategies import covering_array, get_strength
+from parametrize.trampoline import TrampolineFactory, make_trampoline_factory
+from parametrize.values import lazy, resolve_parameters, resolving
 
 
-Parameter = Tuple[str, Any]
-Parameters = Tuple[Parameter, ...]
-ParametersList = List[Parameters]
+LAZY_ENV_VAR = "PARAMETRIZE_LAZY"
+
+# (values, id, skip reason) of each case that should be generated
+NativeCases = List[Tuple[Tuple[Any, ...], str, Optional[str]]]
+NativeParametrization = Callable[[Callable, Tuple[str, ...], NativeCases], Any]
+# argvalues are consumed by chunks of rows, so huge generators are validated and named incrementally
+ROWS_CHUNK_SIZE = 1024
+
+_DECORATOR_HEAD = re.compile(r"@\s*([^\W\d]\w*)")
+
+
+class _Parametrized:
+    def __repr__(self):
+        return "<parametrized>"
+
+
+PARAMETRIZED = _Parametrized()  # default of parametrized arguments in signatures of cases
 
 
 class UnparametrizedMethod:
@@ -33,43 +91,442 @@ class UnparametrizedMethod:
         return f"{self.func.__name__}[...]"
 
 
+class ParametrizedMethod:
+    # Single parametrized case of a function, bound to the instance as a regular function would.
+    # All cases of a function share the context, so each of them stores only its index and name,
+    # values of the case are decoded from the index when it's called.
+    # Class docstring is not defined, since __doc__ of the parametrized function is used instead.
+
+    __slots__ = ("context", "index", "__name__")
+
+    def __init__(self, context: "ParametrizeContext", index: int, name: str):
+        self.context = context
+        self.index = index
+        self.__name__ = name
+
+    def __call__(self, *args, **kwargs):
+        parameters = self.context.get_case_arguments(self.index)
+        if kwargs:
+            parameters.update(kwargs)
+        recorder = instrumentation.active
+        if recorder is not None and recorder.case_timing:
+            name = self.context.get_case_full_name(self.__name__)
+            return recorder.call_case(name, self.context.func, *args, **parameters)
+        return self.context.func(*args, **parameters)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def __getattr__(self, item):
+        if item == "__qualname__":  # can't be defined as a property in class body
+            return self.context.get_case_qualname(self.__name__)
+        # attributes set by other decorators, e.g. __unittest_skip__ or pytestmark
+        return getattr(self.context.func, item)
+
+    @property
+    def __doc__(self):  # type: ignore[override]
+        return self.context.func.__doc__
+
+    @property
+    def __wrapped__(self):
+        return self.context.func
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        """
+        Signature with defaults of parametrized arguments, so pytest doesn't treat them as fixtures
+
+        Values of the case aren't decoded for it, pytest looks it up several times per case.
+        """
+        parametrized = set(self.context.case_argnames)
+        signature = self.context.signature
+        return inspect.Signature(
+            [
+                param.replace(default=PARAMETRIZED) if name in parametrized else param
+                for name, param in signature.parameters.items()
+            ],
+            return_annotation=signature.return_annotation,
+            # parameters with defaults may now go before ones without defaults
+            __validate_parameters__=False,
+        )
+
+    def __repr__(self):
+        return f"<parametrized function {self.__qualname__}>"
+
+
+class SkippedParametrizedMethod(ParametrizedMethod):
+    # Case skipped with param(..., skip=...), skip reason is known before the case is built.
+    # unittest checks __unittest_skip__ before setUp, pytest catches SkipTest for plain functions.
+
+    __slots__ = ("reason",)
+    __unittest_skip__ = True
+
+    def __init__(self, context: "ParametrizeContext", index: int, name: str, reason: str):
+        super().__init__(context, index, name)
+        self.reason = reason
+
+    def __call__(self, *args, **kwargs):
+        raise SkipTest(self.reason)
+
+    @property
+    def __unittest_skip_why__(self):
+        return self.reason
+
+
+class CachedParametrizedMethod(ParametrizedMethod):
+    # Case skipped when it passed before with the same code and values, see parametrize.cache.
+
+    __slots__ = ("cache",)
+
+    def __init__(self, context: "ParametrizeContext", index: int, name: str, cache: ResultCache):
+        super().__init__(context, index, name)
+        self.cache = cache
+
+    def __call__(self, *args, **kwargs):
+        call = super().__call__
+        return _call_cached(self.context, self.index, self.cache, call, args, kwargs)
+
+
+def _cached_trampoline(
+    trampoline: FunctionType, context: "ParametrizeContext", index: int, cache: ResultCache
+) -> FunctionType:
+    # trampolines are plain functions, so their cases are skipped by a wrapper instead
+    @functools.wraps(trampoline)
+    def cached(*args, **kwargs):
+        return _call_cached(context, index, cache, trampoline, args, kwargs)
+
+    return cast(FunctionType, cached)
+
+
+def _call_cached(
+    context: "ParametrizeContext",
+    index: int,
+    cache: ResultCache,
+    func: Callable,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> Any:
+    key = context.get_cache_key(index)
+    if key is not None and key in cache:
+        raise SkipTest("cached: passed before with the same code and parameters")
+    result = func(*args, **kwargs)
+    if key is not None and passed(args):
+        # files are taken after the run, so modules imported by the case itself are among them
+        cache.add(key, loaded_files(context.func))
+    return result
+
+
+class LazyParametrizedMethod:
+    """
+    Lightweight placeholder for a parametrized method, that is built on the first lookup
+    """
+
+    __slots__ = ("context", "index", "name")
+
+    def __init__(self, context: "ParametrizeContext", index: int, name: str):
+        self.context = context
+        self.index = index
+        self.name = name
+
+    def materialize(self) -> Union[ParametrizedMethod, FunctionType]:
+        return self.context.make_method(self.index, self.name)
+
+    def __set_name__(self, owner, name):
+        # only unittest (and pytest collecting unittest.TestCase) looks up tests via getattr()
+        # pytest inspects plain classes through __dict__, so there method must exist right away
+        if not issubclass(owner, TestCase):
+            setattr(owner, name, self.materialize())
+
+    def __get__(self, instance, owner=None):
+        method = self.materialize()
+        if owner is not None:
+            setattr(owner, self.name, method)  # replace placeholder, so it's built only once
+        return method.__get__(instance, owner)
+
+    def __repr__(self):
+        return f"<lazy {self.name}>"
+
+
+class NativelyParametrizedMethod:
+    """
+    Placeholder in a class body, used when tests are parametrized natively by pytest
+
+    pytest can't parametrize methods of unittest.TestCase, so cases are generated as usual there.
+    Owner of the method is unknown until the class is created, so the choice is made then.
+    """
+
+    __slots__ = ("context",)
+
+    def __init__(self, context: "ParametrizeContext"):
+        self.context = context
+
+    def __set_name__(self, owner, name):
+        if issubclass(owner, TestCase):
+            _set_test_cases(self.context, _ClassNamespace(owner))
+            setattr(owner, name, UnparametrizedMethod(self.context.func))
+        else:
+            setattr(owner, name, _parametrize_natively(self.context, _ClassNamespace(owner)))
+
+    def __repr__(self):
+        return f"{self.context.func.__name__}[...]"
+
+
+class _ClassNamespace:
+    # namespace of already created class, so methods can be added to it like to class body
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner: type):
+        self.owner = owner
+
+    def __contains__(self, name: str) -> bool:
+        return name in vars(self.owner)
+
+    def __setitem__(self, name: str, value: Any):
+        setattr(self.owner, name, value)
+
+
 class ParametrizeContext:
     __slots__ = (
         "func",
         "parametrizes_left",
         "all_parameters",
         "seen_argnames",
-        "signature",
+        "argnames",
+        "_signature",
         "decoration_frame",
+        "options",
+        "case_argnames",
+        "_trampoline",
+        "_is_coroutine",
+        "_digest",
     )
 
     def __init__(self, func: FunctionType, decoration_frame: FrameType):
         self.func = func
-        self.signature = inspect.signature(func)
-        self.parametrizes_left = _count_parametrize_decorators(func, decoration_frame)
-        self.all_parameters: List[ParametersList] = []
+        self.argnames = _get_argnames(func)
+        self._signature: Optional[inspect.Signature] = None
+        count = manifest.get_decorators_count(func)
+        if count is None:
+            with instrumentation.step("count_parametrize_decorators", func.__module__):
+                count = _count_parametrize_decorators(func, decoration_frame)
+            manifest.record(func, decorators=count)
+        self.parametrizes_left = count
+        self.all_parameters: List[ParametersTable] = []
         self.seen_argnames: Set[str] = set()
-        self.decoration_frame = decoration_frame
+        self.decoration_frame: Optional[FrameType] = decoration_frame
+        self.options: Dict[str, Any] = {}
+        self.case_argnames: Tuple[str, ...] = ()
+        self._trampoline: Optional[TrampolineFactory] = None
+        self._is_coroutine: Optional[bool] = None
+        self._digest: Optional[str] = None
 
-    def add(self, parameters: ParametersList, argnames_set: Set[str]):
+    def add(
+        self,
+        parameters: "ParametersTable",
+        argnames_set: Set[str],
+        options: Optional[Dict[str, Any]] = None,
+    ):
         reused_names = argnames_set & self.seen_argnames
         if reused_names:
             raise TypeError(f"Arguments names reused: {reused_names}")
 
-        if argnames_set - self.signature.parameters.keys():
+        if argnames_set - self.argnames:
             raise TypeError(
                 f"Unexpected argument(s) {argnames_set} "
                 f"for function {self.func.__name__}{self.signature}"
             )
 
+        for option, value in (options or {}).items():
+            if value is None:
+                continue
+            if self.options.setdefault(option, value) != value:
+                raise TypeError(
+                    f"Conflicting values for {option!r} option: {self.options[option]!r} "
+                    f"and {value!r}"
+                )
+
         self.all_parameters.append(parameters)
         self.seen_argnames.update(argnames_set)
         self.parametrizes_left -= 1
 
+    def get_option(self, option: str, default: Any = None) -> Any:
+        return self.options.get(option, default)
+
+    def get_case_parameters(self, index: int) -> Dict[str, Any]:
+        return dict(zip(self.case_argnames, self.get_case_values(index)))
+
+    def get_case_arguments(self, index: int) -> Dict[str, Any]:
+        """
+        Parameters of the case to call the function with, lazy values are built at this point
+        """
+        parameters = self.get_case_parameters(index)
+        if self.has_lazy_values:
+            return resolve_parameters(parameters)
+        return parameters
+
+    def get_case_values(self, index: int) -> Tuple[Any, ...]:
+        tables = self.all_parameters
+        if len(tables) == 1:
+            return tables[0].rows[index]
+        return tuple(
+            itertools.chain.from_iterable(
+                table.rows[position] for table, position in zip(tables, self.get_positions(index))
+            )
+        )
+
+    def get_index(self, positions: Sequence[int]) -> int:
+        """
+        Index of the case with given positions of rows of each decorator, see get_positions()
+        """
+        index = 0
+        for table, position in zip(self.all_parameters, positions):
+            index = index * len(table) + position
+        return index
+
+    def get_positions(self, index: int) -> List[int]:
+        """
+        Decodes positions of rows of each decorator from index of the case in their product
+
+        Index is a mixed-radix number, each digit is a position of the row in its decorator,
+        the last decorator changes the fastest, same as in itertools.product()
+        """
+        positions = []
+        for table in reversed(self.all_parameters):
+            index, position = divmod(index, len(table))
+            positions.append(position)
+        positions.reverse()
+        return positions
+
+    def get_skip_reason(self, index: int) -> Optional[str]:
+        tables = self.all_parameters
+        if not any(table.skips for table in tables):
+            return None
+        for table, position in zip(tables, self.get_positions(index)):
+            reason = table.skips.get(position)
+            if reason is not None:
+                return reason
+        return None
+
+    def get_case_qualname(self, name: str) -> str:
+        *path, _name = self.func.__qualname__.rsplit(".", maxsplit=1)
+        return ".".join([*path, name])
+
+    def get_cache_key(self, index: int) -> Optional[str]:
+        """
+        Key of the case in result cache, None if it can't be cached
+        """
+        if self._digest is None:
+            self._digest = function_digest(self.func) or ""
+        if not self._digest:
+            return None
+        return case_key(self._digest, self.case_argnames, self.get_case_values(index))
+
+    def get_case_full_name(self, name: str) -> str:
+        return f"{self.func.__module__}.{self.get_case_qualname(name)}"
+
+    def make_method(self, index: int, name: str) -> Union[ParametrizedMethod, FunctionType]:
+        reason = self.get_skip_reason(index)
+        if reason is not None:
+            return SkippedParametrizedMethod(self, index, name, reason)
+
+        cache = get_cache() if not self.is_coroutine else None
+        # only real coroutine functions are recognized as such by asyncio and unittest
+        if not self.get_option("trampolines") and not self.is_coroutine:
+            if cache is not None:
+                return CachedParametrizedMethod(self, index, name, cache)
+            return ParametrizedMethod(self, index, name)
+
+        if self._trampoline is None:
+            func = self.func
+            # signature of wrapped function is taken from __wrapped__, it can't be mirrored
+            plain = isinstance(func, FunctionType) and "__wrapped__" not in func.__dict__
+            with instrumentation.step("make_trampoline_factory", func.__module__):
+                self._trampoline = make_trampoline_factory(
+                    func,
+                    self.signature if plain else None,
+                    self.case_argnames,
+                    self.is_coroutine,
+                    # trampolines bind values when created, so lazy ones are resolved on each call
+                    target=resolving(func) if self.has_lazy_values else None,
+                )
+        trampoline = self._trampoline(
+            name, self.get_case_qualname(name), self.get_case_values(index)
+        )
+        if cache is not None:
+            trampoline = _cached_trampoline(trampoline, self, index, cache)
+        recorder = instrumentation.active
+        if recorder is not None and recorder.case_timing:
+            return cast(FunctionType, recorder.timed(trampoline, self.get_case_full_name(name)))
+        return trampoline
+
+    @property
+    def has_lazy_values(self) -> bool:
+        return any(table.has_lazy_values for table in self.all_parameters)
+
     @property
-    def combined_parameters(self):
-        for case in itertools.product(*self.all_parameters):
-            yield {k: v for params in case for k, v in params}
+    def is_coroutine(self) -> bool:
+        if self._is_coroutine is None:
+            self._is_coroutine = inspect.iscoroutinefunction(self.func)
+        return self._is_coroutine
+
+    @property
+    def signature(self) -> inspect.Signature:
+        if self._signature is None:
+            self._signature = inspect.signature(self.func)
+        return self._signature
+
+    @property
+    def combined_argnames(self) -> Tuple[str, ...]:
+        return tuple(name for parameters in self.all_parameters for name in parameters.argnames)
+
+    @property
+    def combined_ids(self) -> Iterator[str]:
+        return map("-".join, itertools.product(*(p.ids for p in self.all_parameters)))
+
+    def get_combined_cases(
+        self, max_cases: Optional[int] = None, rng: Optional[Random] = None
+    ) -> Iterable[Tuple[int, str]]:
+        """
+        Index and id of each combination of values chosen by the strategy
+
+        If there are more than max_cases of them, a sample of them is drawn with rng,
+        indexes of the sample are drawn straight from the range, the product is never enumerated.
+        """
+        tables = self.all_parameters
+        strength = get_strength(self.get_option("strategy"))
+        if strength is None:
+            total = functools.reduce(operator.mul, (len(table) for table in tables), 1)
+            if max_cases is None or total <= max_cases:
+                return enumerate(self.combined_ids)
+            indexes = sample(range(total), max_cases, rng or get_random(None, ""))
+        else:
+            rows = covering_array([len(table) for table in tables], strength)
+            indexes = sorted(self.get_index(row) for row in rows)
+            if max_cases is not None and len(indexes) > max_cases:
+                indexes = sample(indexes, max_cases, rng or get_random(None, ""))
+        return ((index, self.get_case_id(index)) for index in indexes)
+
+    def get_case_id(self, index: int) -> str:
+        """
+        Id of the case, same as the one it gets when all combinations are generated
+
+        Cases with the same ids are numbered in order of the product: a, a:1, b, a:2...
+        Number of the case is its rank among them, read as a mixed-radix number
+        from ranks of its rows among rows with the same ids, and counts of such rows.
+        Other collisions, e.g. with given ids like "a:1", are resolved by UniqueIds.
+        """
+        tables = self.all_parameters
+        positions = self.get_positions(index)
+        number = 0
+        for table, position in zip(tables, positions):
+            ranks, counts = table.repeats
+            if counts:
+                number = number * counts.get(table.ids[position], 1) + ranks.get(position, 0)
+        case_id = "-".join(table.ids[p] for table, p in zip(tables, positions))
+        return f"{case_id}:{number}" if number else case_id
 
     def __call__(self, *args, **kwargs):
         """
@@ -81,7 +538,20 @@ class ParametrizeContext:
         )
 
 
-def parametrize(argnames: Union[str, Iterable[str]], argvalues: Iterable[Any]):
+def parametrize(
+    argnames: Union[str, Iterable[str]],
+    argvalues: Iterable[Any],
+    *,
+    ids: IdsOption = None,
+    lazy: Optional[bool] = None,
+    trampolines: Optional[bool] = None,
+    subtests: Optional[bool] = None,
+    concurrency: Optional[int] = None,
+    workers: Optional[int] = None,
+    strategy: Optional[str] = None,
+    max_cases: Optional[int] = None,
+    seed: Optional[Union[int, str]] = None,
+):
     """
     class TestSomething(unittest.TestCase):
 
@@ -92,13 +562,52 @@ def parametrize(argnames: Union[str, Iterable[str]], argvalues: Iterable[Any]):
     Trick to use pytest.mark.parametrize with unittest.TestCase
 
     It generates parametrized test cases and injects them into class namespace
+
+    ids are used in names of test cases, same as in pytest: either a list with an id for each set
+    of values, or a function returning an id for each value (None means default id)
+
+    With lazy=True (or PARAMETRIZE_LAZY=1 environment variable) only lightweight placeholders
+    are injected, and each parametrized method is built when it's looked up for the first time
+
+    With trampolines=True each case is a generated function calling the original one directly,
+    with parametrized values bound as its defaults. It's faster to call, but takes more memory.
+
+    With subtests=True a single test is generated instead of one per case, running all the cases
+    one after another, each of them is reported as a subtest of it
+
+    With concurrency=N all cases of async function are run by a single test, N at a time,
+    each of them is reported as a subtest of it
+
+    With workers=N all cases are run by a single test in a pool of N threads, they share the test,
+    so they must not change its state. Each case is reported as a subtest once all of them finished
+
+    strategy chooses combinations of values of stacked decorators to generate:
+    "product" (default) generates all of them, "pairwise" covers each pair of values
+    of any two decorators at least once, "N-wise" does the same for any N of them
+
+    With max_cases=K only a sample of K cases is generated, the same for the same seed.
+    Both can be overridden globally with parametrize.sampling.configure() or environment variables
     """
 
-    parameters, argnames_set = _collect_parameters(argnames, argvalues)
+    with instrumentation.step("collect_parameters"):
+        parameters, argnames_set = _collect_parameters(argnames, argvalues, ids)
+    options = {
+        "lazy": lazy,
+        "trampolines": trampolines,
+        "subtests": subtests,
+        "concurrency": concurrency,
+        "workers": workers,
+        "strategy": strategy,
+        "max_cases": max_cases,
+        "seed": seed,
+    }
+    get_strength(strategy)  # fail early on unknown strategy
+    if max_cases is not None and max_cases < 1:
+        raise ValueError(f"max_cases must be a positive number, got {max_cases}")
 
     def decorator(
         func_or_context: Union[FunctionType, ParametrizeContext],
-    ) -> Union[ParametrizeContext, UnparametrizedMethod]:
+    ) -> Union[ParametrizeContext, UnparametrizedMethod, NativelyParametrizedMethod, FunctionType]:
         if isinstance(func_or_context, UnparametrizedMethod):  # we should never end up here
             raise RuntimeError(
                 "Failed to complete parametrization. "
@@ -111,89 +620,297 @@ def parametrize(argnames: Union[str, Iterable[str]], argvalues: Iterable[Any]):
             decoration_frame = cast(FrameType, inspect.currentframe().f_back)  # type: ignore
             context = ParametrizeContext(func_or_context, decoration_frame)
 
-        context.add(parameters, argnames_set)
+        context.add(parameters, argnames_set, options)
 
         if context.parametrizes_left:
             return context  # pass context to the next parametrize decorator
-        else:
-            # set parametrized functions in place of given one
-            _set_test_cases(context)
-            return UnparametrizedMethod(context.func)
+
+        if is_grouped(context):
+            context.decoration_frame = None
+            with instrumentation.step("make_grouped_method", context.func.__module__):
+                cases = list(_get_cases(context))
+                grouped = make_grouped_method(context, cases)
+            name = context.get_case_full_name(context.func.__name__)
+            instrumentation.count_cases(name, len(cases))
+            return grouped
+
+        if _native_parametrization is not None:
+            frame = cast(FrameType, context.decoration_frame)
+            if frame.f_locals is frame.f_globals:
+                return _parametrize_natively(context)
+            if "__module__" in frame.f_locals and "__qualname__" in frame.f_locals:
+                context.decoration_frame = None  # it's a class body
+                return NativelyParametrizedMethod(context)
+
+        # set parametrized functions in place of given one
+        _set_test_cases(context)
+        return UnparametrizedMethod(context.func)
 
     decorator.__parametrize_decorator__ = parametrize  # type: ignore
 
     return decorator
 
 
-def _collect_parameters(argnames, argvalues) -> Tuple[ParametersList, Set[str]]:
+class param:
+    """
+    Values of a single case with its own id, or a reason to skip it, similar to pytest.param:
+
+        @parametrize("a,b", [(1, 2), param(3, 4, id="three"), param(5, 6, skip="not ready")])
+
+    skip may be a bool or a reason of skipping. For compatibility with pytest.param,
+    skip and skipif marks are also accepted, their conditions are evaluated right away.
+    """
+
+    __slots__ = ("values", "id", "skip")
+
+    def __init__(
+        self, *values: Any, id: Optional[str] = None, skip: Union[bool, str] = False, marks=()
+    ):
+        self.values = values
+        self.id = id
+        self.skip: Optional[str] = _resolve_skip(skip, marks)
+
+    def __repr__(self):
+        return f"param{self.values!r}"
+
+
+_DEFAULT_SKIP_REASON = "unconditional skip"
+
+
+def _resolve_skip(skip: Union[bool, str], marks) -> Optional[str]:
+    if skip:
+        return skip if isinstance(skip, str) else _DEFAULT_SKIP_REASON
+
+    for mark in marks if isinstance(marks, (list, tuple, set)) else (marks,):
+        mark = getattr(mark, "mark", mark)  # pytest.MarkDecorator holds the mark itself
+        name, args, kwargs = mark.name, mark.args, mark.kwargs
+        if name == "skip":
+            return kwargs.get("reason", args[0] if args else _DEFAULT_SKIP_REASON)
+        if name != "skipif":
+            raise TypeError(f"Unsupported mark {name!r}, only skip and skipif marks can be used")
+        if any(isinstance(condition, str) for condition in args):
+            raise TypeError("Conditions of skipif marks must be booleans, not strings")
+        if any(args) or kwargs.get("condition"):
+            return kwargs.get("reason", _DEFAULT_SKIP_REASON)
+    return None
+
+
+def _as_param(values: Any) -> Optional[param]:
+    if isinstance(values, param):
+        return values
+    # pytest.param() returns ParameterSet, which is a tuple of values, marks and id
+    if isinstance(values, tuple) and getattr(values, "_fields", None) == ("values", "marks", "id"):
+        return param(*values.values, id=values.id, marks=values.marks)  # type: ignore
+    return None
+
+
+class ParametersTable:
+    """
+    Rows of values given to a single parametrize decorator, with an id for each row
+    """
+
+    __slots__ = ("argnames", "rows", "ids", "skips", "has_lazy_values", "_repeats")
+
+    def __init__(self, argnames: Tuple[str, ...]):
+        self.argnames = argnames
+        self.rows: Sequence[Tuple[Any, ...]] = []  # a list, or a RowSource decoding its rows
+        self.ids: Sequence[str] = []
+        self.skips: Dict[int, str] = {}  # reasons of skipped rows by their positions
+        self.has_lazy_values = False
+        self._repeats: Optional[Tuple[Dict[int, int], Dict[str, int]]] = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def repeats(self) -> Tuple[Dict[int, int], Dict[str, int]]:
+        """
+        Ranks of rows among rows with the same id, and counts of repeated ids
+
+        Only repeated ones are kept, rank of any other row is 0 and its id is counted once.
+        """
+        if self._repeats is None:
+            ranks: Dict[int, int] = {}
+            counts: Dict[str, int] = {}
+            if not isinstance(self.ids, PositionIds):  # positions never repeat
+                for position, id_ in enumerate(self.ids):
+                    rank = counts.get(id_, 0)
+                    if rank:
+                        ranks[position] = rank
+                    counts[id_] = rank + 1
+                counts = {id_: count for id_, count in counts.items() if count > 1}
+            self._repeats = ranks, counts
+        return self._repeats
+
+
+def _collect_parameters(argnames, argvalues, ids: IdsOption = None):
     if isinstance(argnames, str):
         argnames = list(map(str.strip, argnames.split(",")))
 
+    argnames = tuple(argnames)
     argnames_set = set(argnames)
 
     if len(argnames) != len(argnames_set):
         raise TypeError("Arguments must not repeat")
 
-    parameters = []
-    for i, values in enumerate(argvalues):
-        if len(argnames) == 1 and isinstance(values, str) or not isinstance(values, Iterable):
-            values = (values,)
+    ids = normalize_ids(ids)
+    parameters = ParametersTable(argnames)
+    if isinstance(argvalues, RowSource):
+        _collect_source(parameters, argvalues, ids)
+        return parameters, argnames_set
 
-        if len(values) != len(argnames):
-            raise ValueError(
-                f"Wrong number of values at index {i}, expected "
-                f"{len(argnames)}, got {len(values)}: {values}"
+    rows_list: List[Tuple[Any, ...]] = []
+    ids_list: List[str] = []
+    parameters.rows, parameters.ids = rows_list, ids_list
+    values_iterator = iter(argvalues)
+    for chunk in iter(lambda: list(itertools.islice(values_iterator, ROWS_CHUNK_SIZE)), []):
+        start = len(parameters)
+        params = {i: p for i, p in enumerate(map(_as_param, chunk)) if p is not None}
+        for i, case in params.items():
+            chunk[i] = case.values  # values of param are never unpacked
+            if case.skip is not None:
+                parameters.skips[start + i] = case.skip
+
+        rows = [_make_row(argnames, start + i, values) for i, values in enumerate(chunk)]
+        if not parameters.has_lazy_values:
+            parameters.has_lazy_values = any(
+                isinstance(value, lazy) for value in itertools.chain.from_iterable(rows)
             )
+        chunk_ids = make_ids(argnames, rows, ids, start=start)
+        for i, case in params.items():
+            if case.id is not None:
+                chunk_ids[i] = format_custom_id(case.id)
 
-        parameters.append(tuple(zip(argnames, values)))
+        ids_list.extend(chunk_ids)
+        rows_list.extend(rows)
 
+    check_ids_count(ids, len(parameters))
     return parameters, argnames_set
 
 
+def _collect_source(parameters: ParametersTable, source: RowSource, ids: IdsOption):
+    # rows are kept in the source and decoded when their cases run
+    if source.argnames != parameters.argnames:
+        raise ValueError(
+            f"Arguments of the source {source.argnames} don't match {parameters.argnames}"
+        )
+    parameters.rows = source
+    if ids is None:
+        parameters.ids = source.ids if source.ids is not None else PositionIds(len(source))
+        return
+
+    check_ids_count(ids, len(source))
+    if not callable(ids):
+        parameters.ids = [
+            str(index) if id_ is None else format_custom_id(id_) for index, id_ in enumerate(ids)
+        ]
+        return
+
+    source_ids: List[str] = []
+    for start in range(0, len(source), ROWS_CHUNK_SIZE):
+        stop = start + ROWS_CHUNK_SIZE
+        rows = source[start:stop]
+        source_ids.extend(make_ids(parameters.argnames, rows, ids, start=start))
+    parameters.ids = source_ids
+
+
+def _make_row(argnames: Tuple[str, ...], index: int, values: Any) -> Tuple[Any, ...]:
+    if len(argnames) == 1 and isinstance(values, str) or not isinstance(values, Iterable):
+        values = (values,)
+    elif not isinstance(values, tuple):
+        values = tuple(values)  # rows may be lists or even generators
+
+    if len(values) != len(argnames):
+        raise ValueError(
+            f"Wrong number of values at index {index}, expected "
+            f"{len(argnames)}, got {len(values)}: {values}"
+        )
+    return values
+
+
+def _get_argnames(func) -> Set[str]:
+    if not isinstance(func, FunctionType) or "__wrapped__" in func.__dict__ or (
+        "__signature__" in func.__dict__
+    ):
+        return set(inspect.signature(func).parameters)
+
+    # reading names from code object is much cheaper than building the whole signature
+    code = func.__code__
+    return set(code.co_varnames[: code.co_argcount + code.co_kwonlyargcount])
+
+
+def _is_parametrize_decorator(value: Any) -> bool:
+    with suppress(ValueError):  # inspect.unwrap() may raise ValueError
+        return (
+            value is parametrize
+            or getattr(value, "__parametrize_decorator__", False) is parametrize
+            or (
+                hasattr(value, "__dict__")
+                and "__wrapped__" in value.__dict__
+                and inspect.unwrap(value) is parametrize
+            )
+        )
+    return False
+
+
+_aliases = AliasResolver(_is_parametrize_decorator)
+
+
 def _find_possible_decorators(
     namespace: Dict[str, Any], search_in_modules: bool = True
 ) -> Set[str]:
-    possible_definitions: Set[str] = set()
-
-    if not search_in_modules and namespace.get("__name__") in sys.builtin_module_names:
-        # don't search in builtin modules
-        return possible_definitions
-
-    for key, value in namespace.items():
-        with suppress(ValueError):  # inspect.unwrap() may raise ValueError
-            if (
-                value is parametrize
-                or getattr(value, "__parametrize_decorator__", False) is parametrize
-                or (
-                    hasattr(value, "__dict__")
-                    and "__wrapped__" in value.__dict__
-                    and inspect.unwrap(value) is parametrize
-                )
-            ):
-                possible_definitions.add(key)
-            elif search_in_modules and isinstance(value, ModuleType):
-                # allow usages like @my_module.my_predefined_params
-                possible_definitions.update(
-                    _find_possible_decorators(value.__dict__, search_in_modules=False)
-                )
-
-    return possible_definitions
+    return _aliases.find(namespace, search_in_modules)
 
 
 def _count_parametrize_decorators(function, decoration_frame):
-    possible_definitions = _find_possible_decorators(
-        {**decoration_frame.f_globals, **decoration_frame.f_locals}
-    )
-    lines, _ = inspect.getsourcelines(function)
+    decorators = get_stacked_decorators(decoration_frame)
+    stacked: List[bool] = []
+    if decorators is not None:
+        stacked = [_is_parametrize_decorator(decorator) for _, decorator in decorators]
+        parametrized_count = sum(stacked)
+        # parametrize decorators must be the outermost ones and go one after another
+        if parametrized_count and all(stacked[-parametrized_count:]):
+            return parametrized_count
+
+    # source code is used when decorators can't be figured out from bytecode,
+    # it also provides better error messages for decorators defined in wrong order
+    try:
+        return _count_parametrize_decorators_in_source(function, decoration_frame)
+    except OSError:
+        if not decorators or not any(stacked):
+            raise
+        first_parametrize = stacked.index(True)
+        misplaced = next(
+            name
+            for index, (name, _) in enumerate(decorators)
+            if index > first_parametrize and not stacked[index]
+        )
+        raise TypeError(
+            f"@{misplaced} must be defined before any of parametrize decorators"
+        ) from None
+
+
+def _count_parametrize_decorators_in_source(function, decoration_frame):
+    f_globals, f_locals = decoration_frame.f_globals, decoration_frame.f_locals
+    possible_definitions = _find_possible_decorators(f_globals)
+    if f_locals is not f_globals:
+        # local names shadow global ones
+        possible_definitions = {name for name in possible_definitions if name not in f_locals}
+        possible_definitions |= _find_possible_decorators(f_locals)
+
+    decorator_lines = get_decorator_lines(function)
+    for line in decorator_lines:
+        # names that existed before, but were rebound after the last scan
+        head = _DECORATOR_HEAD.match(line)
+        if head and head[1] not in possible_definitions:
+            value = f_locals.get(head[1], f_globals.get(head[1]))
+            if _is_parametrize_decorator(value):
+                possible_definitions.add(head[1])
 
-    # maybe it would be safer/better to use ast.parse for that
-    # but for now this method works pretty well
     parametrized_count = 0
     parametrize_decorators_should_end = False
     decorator_out_of_order = False
-    for line in map(str.strip, lines):
-        if line.startswith("def "):
-            break
+    for line in decorator_lines:
         for definition in possible_definitions:
             if line.startswith(f"@{definition}"):
                 if parametrize_decorators_should_end:
@@ -225,41 +942,107 @@ def _count_parametrize_decorators(function, decoration_frame):
     return parametrized_count
 
 
-def _set_test_cases(context):
+def _get_cases(context) -> Iterable[Tuple[int, str]]:
+    """
+    Index and id of each case that should be generated
+    """
     func = context.func
-    used_names: Set[str] = set()
-    namespace = context.decoration_frame.f_locals
+    func_name = func.__name__
+    unique_ids = UniqueIds()
+    # cases are identified by their indexes, values are never touched until the case is called
+    full_name = f"{func.__module__}.{context.get_case_qualname(func_name)}"
+    max_cases, seed = get_overrides()
+    if max_cases is None:
+        max_cases = context.get_option("max_cases")
+    if seed is None:
+        seed = context.get_option("seed")
+    combined = context.get_combined_cases(max_cases or None, get_random(seed, full_name))
+    cases: Iterable[Tuple[int, str]] = (
+        (index, unique_ids.add(case_id)) for index, case_id in combined
+    )
+    selector = get_selector()
+    if selector is not None:
+        cases = (case for case in cases if selector(f"{full_name}[{case[1]}]"))
 
-    for params in context.combined_parameters:
-        parameters_str = "-".join(str(v).replace(".", "-") for v in params.values())
+    shard = get_shard()
+    if shard is not None:
+        cases = list(cases)  # all names are needed to balance cases
+        selected = shard.select(full_name, [f"{full_name}[{case_id}]" for _, case_id in cases])
+        cases = itertools.compress(cases, selected)
 
-        methods_with_same_name = 1
-        final_parameters_str = parameters_str
+    context.case_argnames = context.combined_argnames
+    return cases
 
-        while final_parameters_str in used_names:
-            final_parameters_str = f"{parameters_str}:{methods_with_same_name}"
-            methods_with_same_name += 1
 
-        func_name = func.__name__
-        used_names.add(final_parameters_str)
-        parametrized_name = f"{func_name}[{final_parameters_str}]"
-        if parametrized_name in namespace:
-            raise NameError(
-                f"{func_name!r} parametrized with [{final_parameters_str}] is already defined above"
-            )
+def _set_test_cases(context, namespace=None, cases: Optional[Iterable[Tuple[int, str]]] = None):
+    func_name = context.func.__name__
+    if namespace is None:
+        namespace = context.decoration_frame.f_locals
+        # placeholders only work as class attributes, module level functions are never looked up
+        lazy = context.get_option("lazy", _lazy_by_default()) and (
+            namespace is not context.decoration_frame.f_globals
+        )
+    else:
+        lazy = context.get_option("lazy", _lazy_by_default())
+
+    count = 0
+    with instrumentation.step("set_test_cases", context.func.__module__):
+        for index, final_parameters_str in _get_cases(context) if cases is None else cases:
+            parametrized_name = f"{func_name}[{final_parameters_str}]"
+            if parametrized_name in namespace:
+                raise NameError(
+                    f"{func_name!r} parametrized with [{final_parameters_str}] "
+                    "is already defined above"
+                )
+
+            if lazy:
+                namespace[parametrized_name] = LazyParametrizedMethod(
+                    context, index, parametrized_name
+                )
+            else:
+                namespace[parametrized_name] = context.make_method(index, parametrized_name)
+            count += 1
+
+    instrumentation.count_cases(context.get_case_full_name(func_name), count)
+    context.decoration_frame = None  # frame is not needed anymore, don't keep it alive
+
+
+_native_parametrization: Optional[NativeParametrization] = None
+
+
+def set_native_parametrization(handler: Optional[NativeParametrization]):
+    """
+    Hands parametrization of functions and methods of plain classes to given handler
+
+    Handler receives the function, names of all arguments and values, id and skip reason
+    of each case. It's used by pytest plugin to parametrize tests with pytest.mark.parametrize.
+    """
+    global _native_parametrization
+    _native_parametrization = handler
+
 
-        # creating a wrapper function.
-        # functools.partial alone will not bound to class
-        # functools.partialmethod and other descriptors won't be detected as tests
-        def get_parametrized_method(f, name, parameters):
-            parametrized_func = partial(f, **parameters)
+def _parametrize_natively(context, namespace=None):
+    with instrumentation.step("parametrize_natively", context.func.__module__):
+        selected = list(_get_cases(context))
+        # pytest escapes non-ASCII ids given to it, so such cases are generated as usual
+        native = all(case_id.isascii() for _, case_id in selected)
+        cases: NativeCases = []
+        if native:
+            cases = [
+                (context.get_case_values(index), case_id, context.get_skip_reason(index))
+                for index, case_id in selected
+            ]
+    if not native:
+        _set_test_cases(context, namespace, selected)
+        return UnparametrizedMethod(context.func)
 
-            # copying func with new default parameters and name is necessary for introspection
-            # without it, pytest, for example would think that parametrized values are fixtures
-            @wraps(copy_func(f, name, parameters, context.signature))
-            def parametrized_method(*args, **kwargs):
-                return parametrized_func(*args, **kwargs)
+    context.decoration_frame = None
+    instrumentation.count_cases(context.get_case_full_name(context.func.__name__), len(cases))
+    if not cases or _native_parametrization is None:  # nothing to parametrize, no test to collect
+        return UnparametrizedMethod(context.func)
+    func = resolving(context.func) if context.has_lazy_values else context.func
+    return _native_parametrization(func, context.case_argnames, cases)
 
-            return parametrized_method
 
-        namespace[parametrized_name] = get_parametrized_method(func, parametrized_name, params)
+def _lazy_by_default() -> bool:
+    return os.environ.get(LAZY_ENV_VAR, "").lower() in {"1", "true", "yes"}
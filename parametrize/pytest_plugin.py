@@ -0,0 +1,48 @@
+"""
+pytest plugin, parametrizes functions and methods of plain classes with pytest.mark.parametrize
+
+Enabled with --parametrize-native option or parametrize_native = true in pytest configuration.
+Then pytest generates the cases on its own, so they can be scheduled per case (e.g. by xdist),
+while ids of the cases stay the same. Methods of unittest.TestCase are parametrized as usual,
+and so are tests with non-ASCII ids, since pytest would escape them.
+"""
+import pytest
+
+from parametrize.parametrize import NativeCases, set_native_parametrization
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("parametrize")
+    group.addoption(
+        "--parametrize-native",
+        action="store_true",
+        default=None,
+        help="parametrize tests outside of unittest.TestCase with pytest.mark.parametrize",
+    )
+    parser.addini(
+        "parametrize_native",
+        type="bool",
+        default=False,
+        help="parametrize tests outside of unittest.TestCase with pytest.mark.parametrize",
+    )
+
+
+def pytest_configure(config):
+    native = config.getoption("parametrize_native")
+    if native is None:
+        native = config.getini("parametrize_native")
+    if native:
+        set_native_parametrization(parametrize_natively)
+
+
+def pytest_unconfigure(config):
+    set_native_parametrization(None)
+
+
+def parametrize_natively(func, argnames, cases: NativeCases):
+    argvalues = [
+        values if reason is None else pytest.param(*values, marks=pytest.mark.skip(reason=reason))
+        for values, _, reason in cases
+    ]
+    ids = [case_id for _, case_id, _ in cases]
+    return pytest.mark.parametrize(argnames, argvalues, ids=ids)(func)
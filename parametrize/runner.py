@@ -0,0 +1,366 @@
+"""
+Runs unittest suites in a pool of processes
+
+Tests are discovered once in the main process, and workers are forked from it,
+so modules with parametrized tests are imported and parametrized only once.
+Each worker runs consecutive slices of the discovered tests and sends their results back,
+where they're printed as regular unittest output and optionally saved as JUnit XML.
+"""
+import gc
+import math
+import multiprocessing
+import os
+import pydoc
+import sys
+import time
+import unittest
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, cast
+from xml.etree import ElementTree
+
+from parametrize.parametrize import UnparametrizedMethod
+from parametrize.sharding import save_durations
+
+
+# slices per worker, more of them balance the load better, fewer repeat setUpClass less often
+SLICES_PER_WORKER = 4
+
+SUCCESS = "success"
+FAILURE = "failure"
+ERROR = "error"
+SKIP = "skip"
+EXPECTED_FAILURE = "expected_failure"
+UNEXPECTED_SUCCESS = "unexpected_success"
+FAILED_SUBTESTS = "failed_subtests"  # no outcome of its own, some of its subtests failed
+
+
+class Discovery(NamedTuple):
+    names: Tuple[str, ...] = ()
+    start: str = "."
+    pattern: str = "test*.py"
+    top: Optional[str] = None
+
+
+class Record(NamedTuple):
+    outcome: str
+    test_id: str
+    classname: str
+    name: str
+    description: str
+    short_description: Optional[str]
+    detail: Optional[str]  # traceback or skip reason
+    duration: float
+    started: bool  # errors of class and module fixtures don't belong to any test
+    parent_id: Optional[str] = None  # id of the test a failed subtest belongs to
+
+
+class ParametrizeTestLoader(unittest.TestLoader):
+    """
+    Loads parametrized methods by their original names as well, e.g. module.TestCase.test_method
+    """
+
+    def loadTestsFromName(self, name, module=None):
+        try:
+            return super().loadTestsFromName(name, module)
+        except TypeError:
+            parent_name, _, method_name = name.rpartition(".")
+            parent = getattr(module, parent_name) if module and parent_name else None
+            if parent is None:
+                parent = pydoc.locate(parent_name)
+            if not (
+                isinstance(parent, type)
+                and issubclass(parent, unittest.TestCase)
+                and isinstance(getattr(parent, method_name, None), UnparametrizedMethod)
+            ):
+                raise
+
+            prefix = f"{method_name}["
+            names = [name for name in self.getTestCaseNames(parent) if name.startswith(prefix)]
+            return self.suiteClass(map(parent, names))
+
+
+def discover(discovery: Discovery) -> List[unittest.TestCase]:
+    loader = ParametrizeTestLoader()
+    if discovery.names:
+        if "" not in sys.path and os.getcwd() not in sys.path:
+            sys.path.insert(0, os.getcwd())
+        suite = loader.loadTestsFromNames(discovery.names)
+    else:
+        suite = loader.discover(discovery.start, discovery.pattern, discovery.top)
+    # same as in unittest, modules failed to import are reported as failed tests
+    return list(_iterate_tests(suite))
+
+
+def _iterate_tests(suite: Iterable[Any]):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iterate_tests(test)
+        else:
+            yield test
+
+
+class _RecordingResult(unittest.TestResult):
+    def __init__(self):
+        super().__init__()
+        self.records: List[Record] = []
+        self._started: Dict[str, float] = {}
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._started[test.id()] = time.perf_counter()
+
+    def stopTest(self, test):
+        if test.id() in self._started:  # no outcome was reported, since some of subtests failed
+            self._record(FAILED_SUBTESTS, test)
+        super().stopTest(test)
+
+    def _record(self, outcome: str, test, detail: Optional[str] = None):
+        started = self._started.pop(test.id(), None)
+        duration = time.perf_counter() - started if started is not None else 0.0
+        parent = getattr(test, "test_case", None)  # set by subTest() on its stand-in test
+        parent_id: Optional[str] = None
+        if isinstance(parent, unittest.TestCase):
+            parent_id = parent.id()
+            classname = f"{type(parent).__module__}.{type(parent).__qualname__}"
+            name = f"{parent._testMethodName} {test._subDescription()}"
+        elif isinstance(test, unittest.TestCase):
+            classname = f"{type(test).__module__}.{type(test).__qualname__}"
+            name = test._testMethodName
+        else:
+            classname, name = "", str(test)
+        self.records.append(
+            Record(
+                outcome,
+                test.id(),
+                classname,
+                name,
+                str(test),
+                test.shortDescription(),
+                detail,
+                duration,
+                started is not None,
+                parent_id,
+            )
+        )
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(SUCCESS, test)
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(FAILURE, test, self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(ERROR, test, self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(SKIP, test, reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._record(EXPECTED_FAILURE, test, self.expectedFailures[-1][1])
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._record(UNEXPECTED_SUCCESS, test)
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            outcome = FAILURE if issubclass(err[0], test.failureException) else ERROR
+            errors = self.failures if outcome == FAILURE else self.errors
+            self._record(outcome, subtest, errors[-1][1])
+
+
+_tests: Optional[List[unittest.TestCase]] = None
+_buffer = False
+
+
+def _initialize_worker(discovery: Discovery, buffer: bool):
+    global _tests, _buffer
+    if _tests is None:  # not inherited from the parent process
+        _tests = discover(discovery)
+    _buffer = buffer
+
+
+def _run_slice(bounds: Tuple[int, int]) -> List[Record]:
+    start, stop = bounds
+    assert _tests is not None
+    result = _RecordingResult()
+    result.buffer = _buffer
+    # suite takes care of setUpClass/setUpModule and their teardown
+    unittest.TestSuite(_tests[start:stop])(result)
+    return result.records
+
+
+class _ReportedTest:
+    """
+    Stands for a test that was run in another process
+    """
+
+    __slots__ = ("record",)
+
+    def __init__(self, record: Record):
+        self.record = record
+
+    def id(self) -> str:
+        return self.record.test_id
+
+    def shortDescription(self) -> Optional[str]:
+        return self.record.short_description
+
+    def __str__(self):
+        return self.record.description
+
+
+class _ReplayingResult(unittest.TextTestResult):
+    def _exc_info_to_string(self, err, test):
+        return err  # already formatted by the worker
+
+    def replay(self, record: Record):
+        # reported test only has what printing results needs from a TestCase
+        test = cast(unittest.TestCase, _ReportedTest(record))
+        # tracebacks are passed as they are, instead of exc_info, see _exc_info_to_string()
+        traceback = cast(Any, record.detail)
+        if record.started:
+            self.startTest(test)
+        if record.outcome == SUCCESS:
+            self.addSuccess(test)
+        elif record.outcome == FAILURE:
+            self.addFailure(test, traceback)
+        elif record.outcome == ERROR:
+            self.addError(test, traceback)
+        elif record.outcome == SKIP:
+            self.addSkip(test, record.detail or "")
+        elif record.outcome == EXPECTED_FAILURE:
+            self.addExpectedFailure(test, traceback)
+        elif record.outcome == UNEXPECTED_SUCCESS:
+            self.addUnexpectedSuccess(test)
+        if record.started:
+            self.stopTest(test)
+
+
+def get_slices(count: int, workers: int) -> List[Tuple[int, int]]:
+    size = max(1, math.ceil(count / (workers * SLICES_PER_WORKER)))
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def run(
+    discovery: Discovery,
+    workers: Optional[int] = None,
+    verbosity: int = 1,
+    buffer: bool = False,
+    junit_xml: Optional[str] = None,
+    durations: Optional[str] = None,
+    stream: Any = None,
+) -> unittest.TestResult:
+    global _tests
+    _tests = tests = discover(discovery)
+    processes = max(1, min(workers or os.cpu_count() or 1, len(tests)))
+    records: List[Record] = []
+
+    def run_all(result: _ReplayingResult):
+        slices = get_slices(len(tests), processes)
+        if processes == 1:
+            _initialize_worker(discovery, buffer)
+            _consume(map(_run_slice, slices), result, records)
+            return
+
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        freeze = hasattr(gc, "freeze")  # python 3.7+
+        if freeze:
+            # objects created so far are left alone by gc, so forked workers don't copy their pages
+            gc.freeze()
+        try:
+            with context.Pool(processes, _initialize_worker, (discovery, buffer)) as pool:
+                _consume(pool.imap(_run_slice, slices), result, records)
+        finally:
+            if freeze:
+                gc.unfreeze()
+
+    runner = unittest.TextTestRunner(
+        stream=stream, verbosity=verbosity, resultclass=_ReplayingResult  # type: ignore
+    )
+    result = runner.run(run_all)  # type: ignore[arg-type]
+
+    if junit_xml:
+        write_junit_xml(junit_xml, records)
+    if durations:
+        save_durations(
+            durations, {record.test_id: record.duration for record in records if record.started}
+        )
+    return result
+
+
+def _consume(outputs: Iterable[List[Record]], result: _ReplayingResult, records: List[Record]):
+    for slice_records in outputs:
+        for record in slice_records:
+            result.replay(record)
+        records.extend(slice_records)
+
+
+def write_junit_xml(path: str, records: Sequence[Record]):
+    """
+    Writes a testcase for each test, failed subtests are reported by the test they belong to
+    """
+    root = ElementTree.Element("testsuites")
+    suite = ElementTree.SubElement(root, "testsuite", name="parametrize")
+    counts = dict.fromkeys(("tests", "failures", "errors", "skipped"), 0)
+    total_time = 0.0
+
+    failed_subtests: Dict[str, List[Record]] = {}
+    test_ids = {record.test_id for record in records if record.parent_id is None}
+    for record in records:
+        # skipped subtests aren't reported, their test passes unless others failed
+        if record.parent_id in test_ids and record.outcome in (FAILURE, ERROR):
+            failed_subtests.setdefault(record.parent_id, []).append(record)
+
+    for record in records:
+        if record.parent_id in test_ids:
+            continue
+        case = ElementTree.SubElement(
+            suite,
+            "testcase",
+            classname=record.classname,
+            name=record.name,
+            time=f"{record.duration:.6f}",
+        )
+        counts["tests"] += 1
+        total_time += record.duration
+        outcome, detail = record.outcome, record.detail
+        message = _last_line(detail)
+        failed = failed_subtests.get(record.test_id, [])
+        if failed:
+            if outcome == FAILED_SUBTESTS:
+                outcome = FAILURE if any(sub.outcome == FAILURE for sub in failed) else ERROR
+                message = f"{len(failed)} subtests failed: {_last_line(failed[0].detail)}"
+            details = [f"{subtest.name}:\n{subtest.detail}" for subtest in failed]
+            detail = "\n".join(details + ([detail] if detail else []))
+
+        if outcome in (FAILURE, UNEXPECTED_SUCCESS):
+            counts["failures"] += 1
+            detail = detail or "Unexpected success"
+            element = ElementTree.SubElement(case, "failure", message=message or detail)
+            element.text = detail
+        elif outcome == ERROR:
+            counts["errors"] += 1
+            element = ElementTree.SubElement(case, "error", message=message)
+            element.text = detail
+        elif outcome in (SKIP, EXPECTED_FAILURE):
+            counts["skipped"] += 1
+            reason = detail if outcome == SKIP else "Expected failure"
+            ElementTree.SubElement(case, "skipped", message=_last_line(reason))
+
+    for element in (root, suite):
+        element.attrib.update({key: str(value) for key, value in counts.items()})
+        element.set("time", f"{total_time:.6f}")
+    ElementTree.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def _last_line(text: Optional[str]) -> str:
+    # last line of traceback is the exception itself
+    lines = (text or "").strip().splitlines()
+    return lines[-1] if lines else ""
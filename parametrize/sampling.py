@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+from typing import Any, Optional, Set, Tuple, Union
+
+
+MAX_CASES_ENV_VAR = "PARAMETRIZE_MAX_CASES"
+SEED_ENV_VAR = "PARAMETRIZE_SEED"
+
+Seed = Union[int, str]
+
+_configured: Tuple[Optional[int], Optional[Seed]] = (None, None)
+
+
+def configure(max_cases: Optional[int] = None, seed: Optional[Seed] = None):
+    """
+    Overrides max_cases and seed options of all parametrize decorators
+
+    max_cases=0 generates all cases, even if decorators limit them.
+    Each of the arguments falls back to its environment variable when None:
+    PARAMETRIZE_MAX_CASES and PARAMETRIZE_SEED respectively.
+    """
+    global _configured
+    if max_cases is not None and max_cases < 0:
+        raise ValueError(f"max_cases must not be negative, got {max_cases}")
+    _configured = max_cases, seed
+
+
+def get_overrides() -> Tuple[Optional[int], Optional[Seed]]:
+    """
+    Returns max_cases and seed overriding options of decorators, None if not overridden
+    """
+    max_cases, seed = _configured
+    if max_cases is None:
+        value = os.environ.get(MAX_CASES_ENV_VAR) or None
+        max_cases = int(value) if value is not None else None
+    if seed is None:
+        seed = os.environ.get(SEED_ENV_VAR) or None
+    return max_cases, seed
+
+
+def get_random(seed: Optional[Seed], name: str) -> random.Random:
+    """
+    Random numbers for sampling cases of function with given full name
+
+    Each function gets its own sample, which doesn't depend on other functions,
+    PYTHONHASHSEED or the order of imports.
+    """
+    return random.Random(f"{0 if seed is None else seed}:{name}")
+
+
+def sample(population: Any, count: int, rng: random.Random):
+    """
+    Sorted sample of given range or sequence, ranges are never enumerated
+    """
+    if isinstance(population, range) and abs(population.stop - population.start) > sys.maxsize:
+        # len() of such ranges overflows, so does random.sample(), indexes are drawn one by one
+        size = -(-(population.stop - population.start) // population.step)
+        if count > size:
+            raise ValueError("Sample larger than population or is negative")
+        chosen: Set[int] = set()
+        while len(chosen) < count:
+            chosen.add(rng.randrange(size))
+        return sorted(population[i] for i in chosen)
+    return sorted(rng.sample(population, count))
@@ -0,0 +1,53 @@
+import os
+import re
+from typing import Callable, Optional, Tuple
+
+
+SELECT_ENV_VAR = "PARAMETRIZE_SELECT"
+
+Selector = Callable[[str], bool]
+
+_configured: Optional[Selector] = None
+_from_env: Tuple[Optional[str], Optional[Selector]] = (None, None)
+
+
+def configure(*patterns: str, predicate: Optional[Selector] = None):
+    """
+    Generate only cases matching any of given patterns, or accepted by the predicate
+
+    Patterns are matched against full names of cases, e.g. "module.Class.test[1-2]",
+    similar to unittest -k: "*" and "?" are wildcards, pattern without them matches any substring.
+    Call without arguments to fall back to PARAMETRIZE_SELECT environment variable.
+    """
+    global _configured
+    if patterns and predicate is not None:
+        raise TypeError("Either patterns or predicate must be given, not both")
+    _configured = predicate or (compile_patterns(patterns) if patterns else None)
+
+
+def get_selector() -> Optional[Selector]:
+    """
+    Returns configured selector or the one set by environment variable, None if all cases needed
+    """
+    global _from_env
+    if _configured is not None:
+        return _configured
+
+    pattern = os.environ.get(SELECT_ENV_VAR) or None
+    if _from_env[0] != pattern:
+        _from_env = pattern, compile_patterns([pattern]) if pattern else None
+    return _from_env[1]
+
+
+def compile_patterns(patterns) -> Selector:
+    expressions = (
+        _translate(pattern if "*" in pattern or "?" in pattern else f"*{pattern}*")
+        for pattern in patterns
+    )
+    pattern = "|".join(f"(?:{expression})" for expression in expressions)
+    return re.compile(pattern).match  # type: ignore[return-value]
+
+
+def _translate(pattern: str) -> str:
+    # unlike fnmatch, brackets are literal, since every parametrized name has them
+    return re.escape(pattern).replace(r"\*", ".*").replace(r"\?", ".") + r"\Z"
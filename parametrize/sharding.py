@@ -0,0 +1,142 @@
+import heapq
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+
+SHARD_INDEX_ENV_VAR = "PARAMETRIZE_SHARD_INDEX"
+SHARD_COUNT_ENV_VAR = "PARAMETRIZE_SHARD_COUNT"
+DURATIONS_ENV_VAR = "PARAMETRIZE_DURATIONS"
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class Shard:
+    """
+    Part of parametrized cases that should be generated on this node
+
+    Each case goes to the shard chosen by crc32 of its full name, e.g. "module.Class.test[1-2]".
+    When durations of the cases from previous runs are known, cases of each parametrized function
+    are distributed with longest-processing-time-first, so shards finish at about the same time.
+    """
+
+    __slots__ = ("index", "count", "durations")
+
+    def __init__(self, index: int, count: int, durations: Optional[Mapping[str, float]] = None):
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index must be in range [0, {count}), got {index}")
+        self.index = index
+        self.count = count
+        self.durations: Mapping[str, float] = durations or {}
+
+    def select(self, function_name: str, case_names: Sequence[str]) -> List[bool]:
+        """
+        Returns whether each of the cases of given function belongs to this shard
+        """
+        known = [self.durations.get(name) for name in case_names]
+        known_durations = [duration for duration in known if duration is not None]
+        if not known_durations:
+            return [_crc32(name) % self.count == self.index for name in case_names]
+
+        # cases that weren't run before are expected to take as long as others do on average
+        default = sum(known_durations) / len(known_durations)
+        weights = [default if duration is None else duration for duration in known]
+        order = sorted(range(len(case_names)), key=lambda i: (-weights[i], case_names[i]))
+
+        # different functions start from different shards, so the longest cases don't pile up
+        offset = _crc32(function_name)
+        loads = [(0.0, (shard - offset) % self.count, shard) for shard in range(self.count)]
+        selected = [False] * len(case_names)
+        for i in order:
+            load, position, shard = heapq.heappop(loads)
+            selected[i] = shard == self.index
+            heapq.heappush(loads, (load + weights[i], position, shard))
+        return selected
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.index}, {self.count})"
+
+
+_configured: Optional[Shard] = None
+_from_env: Tuple[Any, Optional[Shard]] = (None, None)
+
+
+def configure(
+    index: Optional[int],
+    count: int = 1,
+    durations: Union[PathLike, Mapping[str, float], None] = None,
+):
+    """
+    Generate only cases of given shard, takes precedence over environment variables
+
+    durations are either a mapping of full case names to seconds, or path to JSON file with it.
+    Pass None as index to fall back to environment variables.
+    """
+    global _configured
+    if index is None:
+        _configured = None
+        return
+    if durations is not None and not isinstance(durations, Mapping):
+        durations = load_durations(durations)
+    _configured = Shard(index, count, durations)
+
+
+def get_shard() -> Optional[Shard]:
+    """
+    Returns configured shard or the one set by environment variables, None if not sharded
+    """
+    global _from_env
+    if _configured is not None:
+        return _configured
+
+    key = tuple(
+        os.environ.get(var) for var in (SHARD_INDEX_ENV_VAR, SHARD_COUNT_ENV_VAR, DURATIONS_ENV_VAR)
+    )
+    if _from_env[0] == key:
+        return _from_env[1]
+
+    index, count, durations_path = key
+    shard = None
+    if index is not None or count is not None:
+        if index is None or count is None:
+            raise RuntimeError(
+                f"Both {SHARD_INDEX_ENV_VAR} and {SHARD_COUNT_ENV_VAR} must be set for sharding"
+            )
+        durations = load_durations(durations_path) if durations_path else None
+        shard = Shard(int(index), int(count), durations)
+
+    _from_env = key, shard
+    return shard
+
+
+def get_case_name(test: Any) -> str:
+    """
+    Full name of parametrized case, as used in durations files
+    """
+    # parametrized methods report module of their own class, unlike the function they wrap
+    module = getattr(test, "__wrapped__", test).__module__
+    return f"{module}.{test.__qualname__}"
+
+
+def load_durations(path: PathLike) -> Dict[str, float]:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}  # nothing was recorded yet
+
+
+def save_durations(path: PathLike, durations: Mapping[str, float]):
+    """
+    Merges durations into given file, durations of other cases are kept
+    """
+    merged = {**load_durations(path), **durations}
+    temporary = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(merged, file, indent=0, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def _crc32(name: str) -> int:
+    return zlib.crc32(name.encode(errors="surrogatepass"))
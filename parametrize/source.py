@@ -0,0 +1,91 @@
+import ast
+import inspect
+import linecache
+import os
+from types import FunctionType
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DecoratorsIndex = Dict[int, Tuple[str, ...]]
+
+# filename -> (validation key, decorators of each function by its first line)
+_modules_index: Dict[str, Tuple[Any, DecoratorsIndex]] = {}
+
+
+def get_decorator_lines(function: FunctionType) -> Tuple[str, ...]:
+    """
+    Returns stripped source lines of decorators applied to given function (top to bottom)
+
+    Each module is parsed only once, all of its functions are indexed on the first lookup.
+    The index is invalidated when module file changes its mtime or size.
+    """
+    function = inspect.unwrap(function)
+    code = function.__code__
+    index = _get_index(code.co_filename, function.__globals__)
+
+    if index is None or code.co_firstlineno not in index:
+        # shouldn't happen in general, but source may be unavailable or unparsable
+        lines, _ = inspect.getsourcelines(function)
+        return _scan_decorator_lines(lines)
+
+    return index[code.co_firstlineno]
+
+
+def _get_index(filename: str, module_globals: Dict[str, Any]) -> Optional[DecoratorsIndex]:
+    lines: Optional[List[str]] = None
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        # source lives only in linecache (e.g. IPython cells), same lines list means same source
+        lines = linecache.getlines(filename, module_globals)
+        key: Any = lines
+    else:
+        key = stat.st_mtime_ns, stat.st_size
+
+    cached = _modules_index.get(filename)
+    if cached is not None and (
+        cached[0] is key or (not isinstance(key, list) and cached[0] == key)
+    ):
+        return cached[1]
+
+    if lines is None:
+        linecache.checkcache(filename)
+        lines = linecache.getlines(filename, module_globals)
+
+    index = _build_index(lines)
+    if index is not None:
+        _modules_index[filename] = key, index
+    return index
+
+
+def _build_index(lines: List[str]) -> Optional[DecoratorsIndex]:
+    if not lines:
+        return None
+
+    try:
+        tree = ast.parse("".join(lines))
+    except (SyntaxError, ValueError):
+        return None
+
+    index: DecoratorsIndex = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        decorators = tuple(lines[d.lineno - 1].strip() for d in node.decorator_list)
+        index[node.lineno] = decorators
+        if node.decorator_list:
+            # since python 3.8 first line of decorated function is the line of its first decorator
+            index[node.decorator_list[0].lineno] = decorators
+
+    return index
+
+
+def _scan_decorator_lines(lines: List[str]) -> Tuple[str, ...]:
+    decorators = []
+    for line in map(str.strip, lines):
+        if line.startswith(("def ", "async def ")):
+            break
+        if line.startswith("@"):
+            decorators.append(line)
+    return tuple(decorators)
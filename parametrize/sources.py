@@ -0,0 +1,329 @@
+"""
+Sources of argvalues that keep their rows in place, instead of copying them into tuples
+
+Rows of a source are only decoded when a case using them runs, and unless ids are given
+cases are named by positions of their rows, so no value is turned into a string either.
+"""
+import abc
+import csv
+import io
+import json
+import os
+from array import array as Array
+from typing import Any, BinaryIO, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from parametrize.ids import format_custom_id
+
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class RowSource(Sequence[Tuple[Any, ...]]):
+    """
+    Rows of values for given argnames, each decoded when it's requested
+    """
+
+    argnames: Tuple[str, ...]
+    ids: Optional[Sequence[str]] = None  # ids of the rows, positions of them if None
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abc.abstractmethod
+    def get_row(self, position: int) -> Tuple[Any, ...]:
+        """
+        Decoded row at given position, which is never out of range
+        """
+
+    def __getitem__(self, position):  # type: ignore[override]
+        if isinstance(position, slice):
+            return [self.get_row(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        return self.get_row(position)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return map(self.get_row, range(len(self)))
+
+
+class PositionIds(Sequence[str]):
+    """
+    Default ids of rows of a source: their positions
+    """
+
+    __slots__ = ("size",)
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    @overload
+    def __getitem__(self, position: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[str]:
+        ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(position, slice):
+            return [str(i) for i in range(*position.indices(self.size))]
+        return str(range(self.size)[position])
+
+    def __iter__(self) -> Iterator[str]:
+        return map(str, range(self.size))
+
+
+class ArrayRows(RowSource):
+    """
+    Rows of an array, each of them is a view of the array, not a copy
+
+    With a single argname the whole row is passed, otherwise each argument gets
+    a column of the row. NumPy arrays (including np.memmap) are indexed directly,
+    any other object supporting buffer protocol is viewed with memoryview.
+    """
+
+    __slots__ = ("argnames", "array", "_count", "_columns", "_row_bytes", "_row_shape", "_format")
+
+    def __init__(self, argnames: Tuple[str, ...], array: Any):
+        self.argnames = argnames
+        if _is_array_like(array):
+            self.array = array
+            shape = tuple(array.shape)
+            self._row_bytes: Optional[int] = None  # rows are indexed directly
+            self._format = ""
+        else:
+            view = memoryview(array)
+            if not view.c_contiguous:
+                raise ValueError("Buffer must be C-contiguous to be viewed by rows")
+            shape = view.shape or ()
+            self.array = view.cast("B") if len(shape) > 1 else view
+            self._row_bytes = view.nbytes // shape[0] if len(shape) > 1 and shape[0] else None
+            self._format = view.format
+
+        if not shape:
+            raise ValueError("Array must have at least one dimension")
+        self._count = shape[0]
+        self._row_shape = shape[1:]
+        self._columns = len(argnames) > 1
+        if self._columns and (not self._row_shape or self._row_shape[0] != len(argnames)):
+            raise ValueError(
+                f"Rows of array with shape {shape} can't be split into {len(argnames)} "
+                f"arguments {argnames}"
+            )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_row(self, position: int) -> Tuple[Any, ...]:
+        if self._row_bytes is not None:
+            start = position * self._row_bytes
+            stop = start + self._row_bytes
+            # memoryview can't be indexed by rows, so each row is cast from a slice of bytes
+            row = self.array[start:stop].cast(self._format, self._row_shape)
+        else:
+            row = self.array[position]
+        if self._columns:
+            return tuple(row[column] for column in range(len(self.argnames)))
+        return (row,)
+
+
+def from_array(argnames: Union[str, Sequence[str]], array: Any) -> ArrayRows:
+    """
+    Rows of array, or of any object supporting buffer protocol, as argvalues:
+
+        @parametrize("x,y", from_array("x,y", points))  # points.shape == (n, 2)
+        @parametrize("image", from_array("image", np.load("images.npy", mmap_mode="r")))
+
+    Tests get views of the rows, so they must not change them.
+    Cases are named by positions of the rows: test[0], test[1]...
+    """
+    return ArrayRows(_split_argnames(argnames), array)
+
+
+class FileRows(RowSource):
+    """
+    Rows of a CSV or JSON Lines file, read and decoded one at a time
+
+    Only offsets of the rows are kept in memory, 8 bytes per row, and ids if they're read
+    from a column. The file must not change after it's indexed.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        argnames: Tuple[str, ...],
+        ids: Optional[str] = None,
+        format: Optional[str] = None,
+    ):
+        self.path = os.fspath(path)
+        self.argnames = argnames
+        self.format = format or _guess_format(self.path)
+        if self.format not in ("csv", "jsonl"):
+            raise ValueError(f"Unknown format {self.format!r}, expected 'csv' or 'jsonl'")
+
+        self.offsets = Array("q")
+        self.header: Tuple[str, ...] = ()
+        self._columns: Tuple[int, ...] = ()
+        self._stat = _stat(self.path)
+        with open(self.path, "rb") as file:
+            self._index(file)
+
+        if ids is not None:
+            self.ids = self._read_ids(ids)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get_row(self, position: int) -> Tuple[Any, ...]:
+        with self._open() as file:
+            return self._read_row(file, position)
+
+    def __getitem__(self, position):  # type: ignore[override]
+        if not isinstance(position, slice):
+            return super().__getitem__(position)
+        with self._open() as file:  # consecutive rows are read with a single file
+            return [self._read_row(file, i) for i in range(*position.indices(len(self)))]
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        with self._open() as file:
+            for position in range(len(self)):
+                yield self._read_row(file, position)
+
+    def _index(self, file: BinaryIO):
+        offset = file.tell()
+        record = b""
+        for line in file:
+            start, offset = offset, offset + len(line)
+            if self.format == "csv":
+                # a quoted value may span lines, records end where quotes are balanced
+                record += line
+                if record.count(b'"') % 2:
+                    continue
+                line, record = record, b""
+                start = offset - len(line)
+            if not line.strip():
+                continue
+            if self.format == "csv" and not self.header:
+                self.header = tuple(_parse_csv(line))
+                self._columns = self._get_columns(self.argnames)
+            else:
+                self.offsets.append(start)
+        if record.strip():
+            raise ValueError(f"Unterminated quoted value at the end of {self.path}")
+
+    def _get_columns(self, names: Sequence[str]) -> Tuple[int, ...]:
+        missing = [name for name in names if name not in self.header]
+        if missing:
+            raise ValueError(f"No columns {missing} in {self.path}, its header is {self.header}")
+        return tuple(self.header.index(name) for name in names)
+
+    def _read_ids(self, column: str) -> List[str]:
+        index = self._get_columns([column])[0] if self.format == "csv" else None
+        ids = []
+        with self._open() as file:
+            for position in range(len(self)):
+                values = self._read_values(file, position)
+                if index is not None:
+                    ids.append(format_custom_id(values[index]))
+                elif isinstance(values, dict) and column in values:
+                    ids.append(format_custom_id(values[column]))
+                else:
+                    raise ValueError(f"No {column!r} key in row {position} of {self.path}")
+        return ids
+
+    def _open(self) -> BinaryIO:
+        if _stat(self.path) != self._stat:
+            raise RuntimeError(f"{self.path} changed after its rows were indexed")
+        return open(self.path, "rb")
+
+    def _read_values(self, file: BinaryIO, position: int) -> Any:
+        file.seek(self.offsets[position])
+        if self.format == "jsonl":
+            return json.loads(file.readline())
+
+        line = file.readline()
+        while line.count(b'"') % 2:
+            line += file.readline()
+        values = _parse_csv(line)
+        if len(values) != len(self.header):
+            raise ValueError(
+                f"Wrong number of values in row {position} of {self.path}, "
+                f"expected {len(self.header)}, got {len(values)}"
+            )
+        return values
+
+    def _read_row(self, file: BinaryIO, position: int) -> Tuple[Any, ...]:
+        values = self._read_values(file, position)
+        if self.format == "csv":
+            return tuple(values[column] for column in self._columns)
+
+        if isinstance(values, dict):
+            try:
+                return tuple(values[argname] for argname in self.argnames)
+            except KeyError as e:
+                raise ValueError(
+                    f"No {e.args[0]!r} key in row {position} of {self.path}"
+                ) from None
+        if isinstance(values, list) and len(self.argnames) > 1:
+            if len(values) != len(self.argnames):
+                raise ValueError(
+                    f"Wrong number of values in row {position} of {self.path}, "
+                    f"expected {len(self.argnames)}, got {len(values)}"
+                )
+            return tuple(values)
+        return (values,)
+
+
+def from_file(
+    path: PathLike,
+    argnames: Union[str, Sequence[str]],
+    ids: Optional[str] = None,
+    format: Optional[str] = None,
+) -> FileRows:
+    """
+    Rows of a CSV or JSON Lines file as argvalues, each decoded only when its case runs:
+
+        @parametrize("text,expected", from_file("golden.jsonl", "text,expected", ids="name"))
+
+    The file is read once to index its rows. Values of CSV columns are strings,
+    columns are matched with argnames by the header. Rows of JSON Lines are objects
+    with a key for each argname, or arrays of values. ids names the column or the key
+    holding ids of the rows, otherwise cases are named by positions of the rows.
+    format is "csv" or "jsonl", guessed by extension of the file if not given.
+    """
+    return FileRows(path, _split_argnames(argnames), ids, format)
+
+
+def _guess_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Can't guess format of {path}, pass format='csv' or format='jsonl'")
+    return FORMATS[extension]
+
+
+def _parse_csv(record: bytes) -> List[str]:
+    return next(csv.reader(io.StringIO(record.decode("utf-8-sig"))), [])
+
+
+def _stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _is_array_like(array: Any) -> bool:
+    # numpy and alike are used as they are, without importing them
+    return hasattr(array, "shape") and hasattr(array, "__getitem__") and hasattr(array, "dtype")
+
+
+def _split_argnames(argnames: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+    if isinstance(argnames, str):
+        return tuple(map(str.strip, argnames.split(",")))
+    return tuple(argnames)
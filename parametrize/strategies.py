@@ -0,0 +1,120 @@
+"""
+Combinatorial strategies choosing which combinations of stacked parametrize decorators are run
+
+By default all combinations are, same as with itertools.product().
+With n-wise strategies every combination of values of any n decorators is run at least once,
+which takes much fewer cases: e.g. 38 instead of 15625 for pairs of 6 decorators with 5 values each.
+"""
+import itertools
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+PRODUCT = "product"
+PAIRWISE = "pairwise"
+
+_N_WISE = re.compile(r"([1-9][0-9]*)-wise")
+
+Row = List[Optional[int]]  # positions of values of each decorator, None when any value fits
+
+
+def get_strength(strategy: Optional[str]) -> Optional[int]:
+    """
+    Number of decorators whose combinations of values must all be covered, None for all of them
+    """
+    if strategy is None or strategy == PRODUCT:
+        return None
+    if strategy == PAIRWISE:
+        return 2
+    match = _N_WISE.fullmatch(strategy)
+    if match is None:
+        raise ValueError(
+            f"Unknown strategy {strategy!r}, expected {PRODUCT!r}, {PAIRWISE!r} or 'N-wise'"
+        )
+    return int(match.group(1))
+
+
+def covering_array(sizes: Sequence[int], strength: int) -> List[Tuple[int, ...]]:
+    """
+    Rows of positions, covering each combination of values of any strength decorators
+
+    Built with IPOG: rows covering the first strength decorators are extended one decorator
+    at a time, first by choosing values that cover the most of uncovered combinations in the
+    existing rows, then by adding rows for combinations that are still uncovered.
+    Same sizes always give the same rows.
+    """
+    if not sizes or min(sizes) == 0:
+        return []
+    if strength >= len(sizes):
+        return list(itertools.product(*map(range, sizes)))
+
+    rows: List[Row] = [list(row) for row in itertools.product(*map(range, sizes[:strength]))]
+    for column in range(strength, len(sizes)):
+        combos = list(itertools.combinations(range(column), strength - 1))
+        uncovered: Set[Tuple[Tuple[int, ...], Tuple[int, ...], int]] = {
+            (combo, values, value)
+            for combo in combos
+            for values in itertools.product(*(range(sizes[i]) for i in combo))
+            for value in range(sizes[column])
+        }
+
+        # horizontal growth
+        for row in rows:
+            known = [(combo, _project(row, combo)) for combo in combos]
+            best_value, best_count = 0, -1
+            for value in range(sizes[column]):
+                count = sum(
+                    (combo, values, value) in uncovered
+                    for combo, values in known
+                    if values is not None
+                )
+                if count > best_count:
+                    best_value, best_count = value, count
+            row.append(best_value)
+            if None in row:
+                _fill_free_positions(row, combos, sizes, uncovered)
+            uncovered.difference_update(
+                (combo, values, best_value)
+                for combo, values in ((combo, _project(row, combo)) for combo in combos)
+                if values is not None
+            )
+
+        # vertical growth
+        vertical: Dict[int, List[Row]] = {}  # rows with free positions by value of the column
+        for combo, values, value in sorted(uncovered):
+            for row in vertical.get(value, ()):
+                if all(row[i] is None or row[i] == v for i, v in zip(combo, values)):
+                    break
+            else:
+                row = [None] * (column + 1)
+                row[column] = value
+                vertical.setdefault(value, []).append(row)
+                rows.append(row)
+            for i, v in zip(combo, values):
+                row[i] = v
+
+    return [tuple(0 if position is None else position for position in row) for row in rows]
+
+
+def _fill_free_positions(row: Row, combos, sizes: Sequence[int], uncovered):
+    """
+    Free positions left by vertical growth are taken by values of uncovered combinations
+    """
+    value = row[-1]
+    for combo in combos:
+        free = [n for n, i in enumerate(combo) if row[i] is None]
+        if not free:
+            continue
+        values = [row[i] for i in combo]
+        for candidate in itertools.product(*(range(sizes[combo[n]]) for n in free)):
+            for n, v in zip(free, candidate):
+                values[n] = v
+            if (combo, tuple(values), value) in uncovered:
+                for n, v in zip(free, candidate):
+                    row[combo[n]] = v
+                break
+
+
+def _project(row: Row, combo: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+    values = tuple(row[i] for i in combo)
+    return None if None in values else values  # type: ignore[return-value]
@@ -0,0 +1,161 @@
+import builtins
+from inspect import Parameter, Signature
+from types import FunctionType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from parametrize.utils import copy_code
+
+
+TrampolineFactory = Callable[[str, str, Sequence[Any]], FunctionType]
+
+_FUNCTION = "__parametrized_function__"
+_LEN = "__parametrized_len__"  # parametrized arguments may shadow builtins
+_ARGS, _KWARGS = "__args__", "__kwargs__"
+_RESERVED_NAMES = (_FUNCTION, _LEN, _ARGS, _KWARGS)
+
+
+def make_trampoline_factory(
+    func: Callable,
+    signature: Optional[Signature],
+    argnames: Sequence[str],
+    is_coroutine: bool = False,
+    target: Optional[Callable] = None,
+) -> TrampolineFactory:
+    """
+    Compiles code calling given function directly with parametrized values, once per function
+
+    Returned factory creates a function for every case, sharing the compiled code.
+    Values of the case are stored as keyword-only defaults of that function,
+    so nothing is merged on each call, and introspection shows them as defaults.
+    Trampolines of coroutine functions are coroutine functions themselves.
+    target is the function actually called, if it's not func itself.
+    """
+    reserved = set(argnames).intersection(_RESERVED_NAMES)
+    if reserved:
+        raise TypeError(f"Arguments names reserved for trampolines: {reserved}")
+
+    mirrored = _mirror_signature(signature, argnames) if signature is not None else None
+    kwdefaults: Dict[str, Any]
+    if mirrored is None:
+        source, defaults, kwdefaults = _generic_source(argnames), None, {}
+    else:
+        source, defaults, kwdefaults = mirrored
+
+    if is_coroutine:
+        # asyncio and unittest tell coroutine functions by flags of their code
+        source = source.replace("def trampoline(", "async def trampoline(").replace(
+            f"return {_FUNCTION}(", f"return await {_FUNCTION}("
+        )
+
+    code = _compile(source, func)
+    # frames of trampolines are hidden from tracebacks by both unittest and pytest
+    namespace = {
+        _FUNCTION: func if target is None else target,
+        _LEN: len,
+        "__builtins__": builtins,  # not filled in automatically before python 3.10
+        "__unittest": True,
+        "__tracebackhide__": True,
+    }
+    attributes = getattr(func, "__dict__", None)
+
+    def make(name: str, qualname: str, values: Sequence[Any]) -> FunctionType:
+        trampoline = FunctionType(code, namespace, name, defaults)
+        trampoline.__kwdefaults__ = {**kwdefaults, **dict(zip(argnames, values))}
+        trampoline.__qualname__ = qualname
+        trampoline.__module__ = func.__module__
+        trampoline.__doc__ = func.__doc__
+        if attributes:
+            trampoline.__dict__.update(attributes)
+        return trampoline
+
+    return make
+
+
+def _compile(source: str, func: Callable) -> Any:
+    module_code = compile(source, "<parametrize trampoline>", "exec")
+    code = next(const for const in module_code.co_consts if hasattr(const, "co_code"))
+    original = getattr(func, "__code__", None)
+    if original is None:
+        return code
+    # point to the original test, so pytest and IDEs show its location
+    return copy_code(
+        code, co_filename=original.co_filename, co_firstlineno=original.co_firstlineno
+    )
+
+
+def _generic_source(argnames: Sequence[str]) -> str:
+    """
+    Used for functions wrapped by other decorators and functions with exotic signatures
+    """
+    parameters = ", ".join(f"{name}=None" for name in argnames)
+    keywords = ", ".join(f"{name}={name}" for name in argnames)
+    return (
+        f"def trampoline(*{_ARGS}, {parameters}, **{_KWARGS}):\n"
+        f"    if {_KWARGS}:\n"
+        f"        return {_FUNCTION}(*{_ARGS}, {keywords}, **{_KWARGS})\n"
+        f"    if {_LEN}({_ARGS}) == 1:\n"
+        f"        return {_FUNCTION}({_ARGS}[0], {keywords})\n"
+        f"    return {_FUNCTION}(*{_ARGS}, {keywords})\n"
+    )
+
+
+def _mirror_signature(
+    signature: Signature, argnames: Iterable[str]
+) -> Optional[Tuple[str, Optional[Tuple[Any, ...]], Dict[str, Any]]]:
+    """
+    Trampoline with the same signature as the original function, parametrized arguments
+    are moved to keyword-only ones, so pytest can still request fixtures from the rest of them.
+
+    Returns None if such signature can't be made.
+    """
+    parametrized = set(argnames)
+    positional: List[str] = []
+    positional_defaults: List[Any] = []
+    calls: List[str] = []
+    keyword_only: List[str] = []
+    kwdefaults: Dict[str, Any] = {}
+    var_positional = var_keyword = None
+    pass_by_keyword = False
+
+    for name, parameter in signature.parameters.items():
+        kind = parameter.kind
+        if name in parametrized:
+            if kind is Parameter.POSITIONAL_ONLY:
+                return None
+            if kind is Parameter.POSITIONAL_OR_KEYWORD:
+                # following arguments would take its position
+                pass_by_keyword = True
+            keyword_only.append(name)
+            calls.append(f"{name}={name}")
+        elif kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD):
+            positional.append(name)
+            if parameter.default is not Parameter.empty:
+                positional_defaults.append(parameter.default)
+            calls.append(f"{name}={name}" if pass_by_keyword else name)
+        elif kind is Parameter.VAR_POSITIONAL:
+            if pass_by_keyword:
+                return None
+            var_positional = name
+            calls.append(f"*{name}")
+        elif kind is Parameter.KEYWORD_ONLY:
+            keyword_only.append(name)
+            if parameter.default is not Parameter.empty:
+                kwdefaults[name] = parameter.default
+            calls.append(f"{name}={name}")
+        else:
+            var_keyword = name
+
+    if var_keyword is not None:
+        calls.append(f"**{var_keyword}")
+
+    definition = list(positional)
+    definition.append(f"*{var_positional}" if var_positional else "*")
+    definition.extend(keyword_only)
+    if var_keyword is not None:
+        definition.append(f"**{var_keyword}")
+
+    source = (
+        f"def trampoline({', '.join(definition)}):\n"
+        f"    return {_FUNCTION}({', '.join(calls)})\n"
+    )
+    return source, tuple(positional_defaults) or None, kwdefaults
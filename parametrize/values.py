@@ -0,0 +1,148 @@
+"""
+Values of parameters that are built only when a case using them runs
+"""
+import functools
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+DEFAULT_MAXSIZE = 32
+
+
+class lazy:
+    """
+    Value built by calling factory when a case using it runs, instead of at import time:
+
+        @parametrize("dataset", [lazy(load_small_dataset), lazy(load_huge_dataset)])
+
+    The value is shared by all cases using it, and kept in LRU cache between them,
+    see configure_cache(). Ids of the cases are based on name of the factory, or given id.
+    """
+
+    __slots__ = ("factory", "id", "_lock")
+
+    def __init__(self, factory: Callable[[], Any], *, id: Optional[str] = None):
+        if not callable(factory):
+            raise TypeError(f"factory must be callable, got {factory!r}")
+        self.factory = factory
+        self.id = id
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.id if self.id is not None else getattr(self.factory, "__name__", None)
+
+    def resolve(self) -> Any:
+        found, value = _cache.get(self)
+        if found:
+            return value
+        with self._lock:  # cases running in threads build the value only once
+            found, value = _cache.get(self)
+            if not found:
+                value = self.factory()
+                _cache.put(self, value)
+        return value
+
+    def __repr__(self):
+        return f"lazy({self.factory!r})"
+
+
+class LRUCache:
+    """
+    Values of lazy parameters, least recently used are evicted first
+
+    maxsize limits number of values, maxbytes limits their total size as measured by sizeof,
+    None means no limit.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = DEFAULT_MAXSIZE,
+        maxbytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._values: "OrderedDict[lazy, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key: lazy) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return False, None
+            self._values.move_to_end(key)
+            return True, entry[0]
+
+    def put(self, key: lazy, value: Any):
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        with self._lock:
+            self._values[key] = value, size
+            self.nbytes += size
+            # the value just built is kept even if it alone exceeds the limits
+            while len(self._values) > 1 and self._is_full():
+                _, (_, evicted_size) = self._values.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self.nbytes = 0
+
+    def _is_full(self) -> bool:
+        return (self.maxsize is not None and len(self._values) > self.maxsize) or (
+            self.maxbytes is not None and self.nbytes > self.maxbytes
+        )
+
+
+_cache = LRUCache()
+
+
+def configure_cache(
+    maxsize: Optional[int] = DEFAULT_MAXSIZE,
+    maxbytes: Optional[int] = None,
+    sizeof: Callable[[Any], int] = sys.getsizeof,
+):
+    """
+    Limits number and total size of lazy values kept alive, values cached so far are dropped
+
+    sizeof should return size of a value in bytes, sys.getsizeof doesn't count objects it refers to,
+    so for nested values a custom function is needed, e.g. lambda frame: frame.memory_usage().sum()
+    """
+    global _cache
+    _cache.clear()
+    _cache = LRUCache(maxsize, maxbytes, sizeof)
+
+
+def resolve_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        name: value.resolve() if isinstance(value, lazy) else value
+        for name, value in parameters.items()
+    }
+
+
+def resolving(func: Callable) -> Callable:
+    """
+    Wraps function, so lazy values passed to it as keyword arguments are resolved
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def resolving_coroutine(*args, **kwargs):
+            return await func(*args, **resolve_parameters(kwargs))
+
+        return resolving_coroutine
+
+    @functools.wraps(func)
+    def resolving_function(*args, **kwargs):
+        return func(*args, **resolve_parameters(kwargs))
+
+    return resolving_function
@@ -0,0 +1,83 @@
+import json
+import sys
+import types
+
+from parametrize.aliases import AliasResolver
+
+
+ALIAS = object()
+
+
+def make_resolver():
+    checked = []
+
+    def is_alias(value):
+        checked.append(value)
+        return value is ALIAS
+
+    return AliasResolver(is_alias), checked
+
+
+def make_module_namespace(monkeypatch, **names):
+    module = types.ModuleType("test_aliases_module")
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    module.__dict__.update(names)
+    return module.__dict__
+
+
+def test_only_new_names_are_scanned(monkeypatch):
+    resolver, checked = make_resolver()
+    namespace = make_module_namespace(monkeypatch, a=1, b=ALIAS)
+
+    assert resolver.find(namespace) == {"b"}
+    assert checked[-3:] == [1, ALIAS, ALIAS]
+
+    checked.clear()
+    namespace["c"] = ALIAS
+    namespace["d"] = 2
+    assert resolver.find(namespace) == {"b", "c"}
+    # new names are scanned, already found aliases are checked again
+    assert sorted(map(id, checked)) == sorted(map(id, [ALIAS, 2, ALIAS, ALIAS]))
+
+
+def test_other_namespaces_are_not_kept():
+    resolver, checked = make_resolver()
+    namespace = {"__name__": "test_aliases_class", "a": ALIAS, "b": 1}
+    assert resolver.find(namespace) == {"a"}
+    assert not resolver._namespaces
+
+    checked.clear()
+    namespace["c"] = ALIAS
+    assert resolver.find(namespace) == {"a", "c"}
+    assert checked.count(1) == 1  # scanned again
+
+
+def test_rebound_and_deleted_names(monkeypatch):
+    resolver, _ = make_resolver()
+    namespace = make_module_namespace(monkeypatch, a=ALIAS, b=ALIAS, c=1)
+    assert resolver.find(namespace) == {"a", "b"}
+
+    namespace["a"] = 1
+    assert resolver.find(namespace) == {"b"}
+
+    del namespace["b"], namespace["c"]
+    namespace["d"] = ALIAS
+    assert resolver.find(namespace) == {"d"}
+
+
+def test_modules():
+    resolver, checked = make_resolver()
+    module = types.ModuleType("my_module")
+    module.params = ALIAS
+    namespace = {"my_module": module, "json": json}
+
+    assert resolver.find(namespace) == {"params"}
+
+    module.other_params = ALIAS
+    assert resolver.find(namespace) == {"params", "other_params"}
+    assert resolver.find(module.__dict__, search_in_modules=False) == {"params", "other_params"}
+
+    # standard library is scanned only once
+    checked.clear()
+    assert resolver.find({"json": json}) == set()
+    assert checked == [json]
@@ -0,0 +1,77 @@
+import re
+import sys
+import textwrap
+from unittest import mock
+
+import pytest
+
+from parametrize import parametrize
+from parametrize.bytecode import SUPPORTED, get_stacked_decorators
+
+
+pytestmark = pytest.mark.skipif(not SUPPORTED, reason="Requires instruction positions")
+
+
+def record(func):
+    func.decorators = get_stacked_decorators(sys._getframe(1))
+    return func
+
+
+class namespace:
+    record = record
+
+
+def test_get_stacked_decorators():
+    @mock.patch(f"{__name__}.record", record)
+    @namespace.record
+    @record
+    def f():
+        ...
+
+    assert [name for name, _ in f.decorators] == ["record", "namespace.record", "mock.patch"]
+    assert f.decorators[0][1] is record
+    assert f.decorators[1][1] is record
+
+
+def test_get_stacked_decorators_when_called_directly():
+    def f():
+        ...
+
+    assert record(f).decorators is None
+
+
+def exec_without_source(code):
+    namespace = {"parametrize": parametrize, "mock": mock, "__name__": __name__}
+    exec(compile(textwrap.dedent(code), "<sourceless>", "exec"), namespace)
+    return namespace
+
+
+def test_parametrize_without_source():
+    namespace = exec_without_source(
+        """
+        c_parameters = parametrize("c", (5, 6))
+
+        class TestSomething:
+            @parametrize("a", (1, 2))
+            @c_parameters
+            @mock.patch("os.getcwd")
+            def test_method(self, getcwd, a, c):
+                ...
+        """
+    )
+    assert {"test_method[5-1]", "test_method[6-2]"} < namespace["TestSomething"].__dict__.keys()
+
+
+def test_misplaced_decorator_without_source():
+    with pytest.raises(
+        TypeError,
+        match=re.escape("@mock.patch must be defined before any of parametrize decorators"),
+    ):
+        exec_without_source(
+            """
+            @mock.patch("os.getcwd")
+            @parametrize("a", (1, 2))
+            def test_function(getcwd, a):
+                ...
+            """
+        )
@@ -0,0 +1,189 @@
+import inspect
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import pytest
+
+from parametrize import cache, parametrize
+from parametrize.cache import ResultCache, case_key, files_digest, function_digest, loaded_files
+from tests.utils import run_unittests
+
+
+@pytest.fixture
+def result_cache(tmp_path, monkeypatch):
+    monkeypatch.delenv(cache.CACHE_ENV_VAR, raising=False)
+    cache.configure(tmp_path / "results")
+    yield cache.get_cache()
+    cache.configure(None)
+
+
+def define_test_case(calls, failing=3):
+    class TestSomething(TestCase):
+        @parametrize("a", [1, 2, 3, object()])
+        def test_method(self, a):
+            calls.append(a)
+            self.assertNotEqual(a, failing)
+
+    return TestSomething
+
+
+def test_passed_cases_are_skipped(result_cache):
+    calls = []
+    result = run_unittests(define_test_case(calls))
+    assert len(calls) == 4 and len(result.failures) == 1 and not result.skipped
+
+    calls.clear()
+    result = run_unittests(define_test_case(calls))
+    assert calls[0] == 3 and len(calls) == 2  # failed one and one that can't be cached
+    assert [reason for _, reason in result.skipped] == [
+        "cached: passed before with the same code and parameters"
+    ] * 2
+
+    calls.clear()
+    run_unittests(define_test_case(calls, failing=2))  # the code is the same, the constant isn't
+    assert len(calls) == 4
+
+
+def test_trampolines_are_cached(result_cache):
+    calls = []
+
+    class TestSomething(TestCase):
+        @parametrize("a", [1, 2], trampolines=True)
+        def test_method(self, a):
+            calls.append(a)
+
+    signature = inspect.signature(TestSomething.__dict__["test_method[1]"])
+    assert signature.parameters["a"].default == 1
+    assert run_unittests(TestSomething).wasSuccessful() and calls == [1, 2]
+    result = run_unittests(TestSomething)
+    assert calls == [1, 2] and len(result.skipped) == 2
+
+
+def test_failed_subtests_are_not_cached(result_cache):
+    class TestSomething(TestCase):
+        @parametrize("a", [1])
+        def test_method(self, a):
+            with self.subTest():
+                self.fail()
+
+    run_unittests(TestSomething)
+    assert not result_cache._load()
+
+
+def test_function_digest():
+    def helper():
+        return 1
+
+    def test(a):
+        return helper() + a
+
+    def test_with_other_body(a):
+        return helper() - a
+
+    def test_moved(a):
+
+        return helper() + a
+
+    assert function_digest(test) == function_digest(test_moved)
+    assert function_digest(test) != function_digest(test_with_other_body)
+    assert function_digest(len) is None
+
+
+def test_files_digest(tmp_path):
+    module = tmp_path / "calc.py"
+    module.write_text("def double(x):\n    return x * 2\n")
+    digest = files_digest([str(module)])
+    assert digest == files_digest([str(module)])
+    assert digest != files_digest([])
+
+    module.write_text("def double(x):\n    return x + x\n")
+    assert files_digest([str(module)]) != digest
+    module.unlink()
+    assert files_digest([str(module)]) != digest
+
+
+def test_loaded_files(monkeypatch, tmp_path):
+    def make_module(name, **names):
+        module = type(sys)(name)
+        module.__file__ = str(tmp_path / f"{name.replace('.', '/')}.py")
+        vars(module).update(names)
+        monkeypatch.setitem(sys.modules, name, module)
+        return module
+
+    helpers = make_module("project.helpers")
+    make_module("project.test_other")
+    base = type("Base", (), {"__module__": make_module("project.test_base").__name__})
+    make_module("project.test_own", helpers=helpers, Base=base)
+
+    def test():
+        pass
+
+    test.__module__ = "project.test_own"
+    files = {os.path.relpath(path, tmp_path) for path in loaded_files(test)}
+    assert {"project/helpers.py", "project/test_own.py", "project/test_base.py"} <= files
+    assert "project/test_other.py" not in files  # editing other tests doesn't run this one again
+    assert os.__file__ not in loaded_files(test)
+
+
+def test_changes_of_code_under_test_are_seen(tmp_path):
+    (tmp_path / "calc.py").write_text(
+        "class Calc:\n    def double(self, x):\n        return x * 2\n"
+    )
+    (tmp_path / "test_calc.py").write_text(
+        "import unittest\n"
+        "from parametrize import parametrize\n"
+        "class TestCalc(unittest.TestCase):\n"
+        "    @parametrize('x', [1, 2])\n"
+        "    def test_double(self, x):\n"
+        "        from calc import Calc  # imported by the first case\n"
+        "        self.assertEqual(Calc().double(x), x + x)\n"
+    )
+    other = "import unittest\nclass TestOther(unittest.TestCase):\n    def test_other(self):\n"
+    (tmp_path / "test_other.py").write_text(f"{other}        pass\n")
+    environment = {**os.environ, cache.CACHE_ENV_VAR: str(tmp_path / "results")}
+    environment["PYTHONPATH"] = os.pathsep.join([os.getcwd(), str(tmp_path)])
+
+    def run_tests():
+        command = [sys.executable, "-m", "unittest", "test_calc", "test_other"]
+        process = subprocess.run(
+            command, cwd=tmp_path, env=environment, stderr=subprocess.PIPE, universal_newlines=True
+        )
+        return process.stderr.strip().splitlines()[-1]
+
+    assert run_tests() == "OK"
+    assert run_tests() == "OK (skipped=2)"
+    (tmp_path / "test_other.py").write_text(f"{other}        self.assertTrue(True)\n")
+    assert run_tests() == "OK (skipped=2)"
+    (tmp_path / "calc.py").write_text(
+        "class Calc:\n    def double(self, x):\n        return x * 3\n"
+    )
+    assert run_tests() == "FAILED (failures=2)"
+
+
+def test_case_key():
+    assert case_key("f", ["a"], [{"x": (1, 2.5)}]) == case_key("f", ["a"], [{"x": (1, 2.5)}])
+    assert case_key("f", ["a"], [1]) != case_key("f", ["a"], [True])
+    assert case_key("f", ["a"], [1]) != case_key("g", ["a"], [1])
+    assert case_key("f", ["a"], [1]) != case_key("f", ["b"], [1])
+    assert case_key("f", ["a"], [{3, 1, 2}]) == case_key("f", ["a"], [{1, 2, 3}])
+    assert case_key("f", ["a"], [object()]) is None
+
+
+def test_concurrent_writers(tmp_path):
+    path = tmp_path / "results"
+    code = (
+        "import sys\n"
+        "from parametrize.cache import ResultCache\n"
+        "cache = ResultCache(sys.argv[1])\n"
+        "for i in range(200):\n"
+        "    cache.add(f'{sys.argv[2]}-{i:032}')\n"
+    )
+    writers = [
+        subprocess.Popen([sys.executable, "-c", code, str(path), str(n)]) for n in range(4)
+    ]
+    assert all(writer.wait() == 0 for writer in writers)
+    lines = path.read_text().splitlines()
+    assert len([line for line in lines if line.startswith("case ")]) == 800
+    assert f"3-{199:032}" in ResultCache(path)
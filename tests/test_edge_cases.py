@@ -163,3 +163,26 @@ def test_pre_parametrized_decorators_in_non_global_namespace_with_another_decora
             @c_parameters
             def test_method(self, a, b):
                 ...
+
+
+def test_conflicting_options():
+    with pytest.raises(
+        TypeError, match=re.escape("Conflicting values for 'lazy' option: False and True")
+    ):
+
+        @parametrize("a", (1, 2), lazy=True)
+        @parametrize("b", (1, 2), lazy=False)
+        def f(a, b):
+            ...
+
+
+def test_wrong_number_of_ids():
+    with pytest.raises(ValueError, match=re.escape("Wrong number of ids, expected 3")):
+        parametrize("a", (i for i in range(3)), ids=["a", "b"])
+
+
+def test_unsupported_mark():
+    with pytest.raises(
+        TypeError, match="Unsupported mark 'xfail', only skip and skipif marks can be used"
+    ):
+        parametrize("a", [pytest.param(1, marks=pytest.mark.xfail)])
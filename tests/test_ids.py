@@ -0,0 +1,90 @@
+import enum
+import sys
+
+import pytest
+
+from parametrize.ids import (
+    MAX_ID_LENGTH,
+    UniqueIds,
+    check_ids_count,
+    format_id,
+    make_ids,
+    normalize_ids,
+)
+
+
+class Color(enum.Enum):
+    RED = 1
+
+
+class Opaque:
+    pass
+
+
+class Unprintable:
+    def __str__(self):
+        raise ValueError
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (1, "1"),
+        (1.5, "1-5"),
+        ("a", "a"),
+        (b"a", "b'a'"),
+        (None, "None"),
+        (True, "True"),
+        (Color.RED, "Color-RED"),
+        (int, "int"),
+        (format_id, "format_id"),
+        ([1, 2], "[1, 2]"),
+        (list(range(100)), "x3"),
+        (Opaque(), "x3"),
+        (Unprintable(), "x3"),
+        ((i for i in ()), "x3"),
+    ],
+)
+def test_format_id(value, expected):
+    assert format_id(value, "x", 3) == expected
+
+
+def test_long_ids_are_truncated():
+    first, second = format_id("a" * 1000, "x", 0), format_id("a" * 999 + "b", "x", 0)
+    assert len(first) == len(second) == MAX_ID_LENGTH
+    assert first != second
+    assert first.startswith("a" * 50)
+
+
+def test_huge_numbers():
+    text = format_id(10**5000, "x", 3)
+    if hasattr(sys, "set_int_max_str_digits"):  # python 3.11+ refuses to convert them
+        assert text == "x3"
+    else:
+        assert text.startswith("1000") and len(text) == MAX_ID_LENGTH
+
+
+def test_make_ids():
+    rows = [(1, 2), (3, 4)]
+    assert make_ids("ab", rows, None) == ["1-2", "3-4"]
+    assert make_ids("ab", rows, ["first", None]) == ["first", "3-4"]
+    assert make_ids("ab", rows, lambda v: f"v{v}" if v > 2 else None) == ["1-2", "v3-v4"]
+    assert make_ids("ab", [(object(), 5)], None, start=7) == ["a7-5"]
+    assert make_ids("ab", rows[1:], ["first", "second"], start=1) == ["second"]
+
+
+def test_ids_validation():
+    check_ids_count(None, 10)
+    with pytest.raises(ValueError, match="Wrong number of ids, expected 1"):
+        check_ids_count(["a", "b"], 1)
+    with pytest.raises(TypeError, match="ids must be a sequence of ids or a callable"):
+        normalize_ids("a")
+    assert normalize_ids(iter("ab")) == ["a", "b"]
+
+
+def test_unique_ids():
+    unique = UniqueIds()
+    assert [unique.add(i) for i in ["a", "a", "a:1", "a", "b"]] == ["a", "a:1", "a:1:1", "a:2", "b"]
+
+    unique = UniqueIds()
+    assert [unique.add(i) for i in ["a", "a:1", "a", "a"]] == ["a", "a:1", "a:2", "a:3"]
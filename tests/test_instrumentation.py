@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from unittest import TestCase
+
+import pytest
+
+from parametrize import instrumentation, parametrize
+from tests.utils import run_unittests
+
+
+@pytest.fixture
+def recorder():
+    yield instrumentation.enable()
+    instrumentation.disable()
+
+
+def test_report(recorder, tmp_path):
+    class TestSomething(TestCase):
+        @parametrize("delay", [0, 0.02])
+        def test_method(self, delay):
+            time.sleep(delay)
+
+        @parametrize("a", [1, 2], trampolines=True)
+        def test_trampolines(self, a):
+            pass
+
+        @parametrize("a", [1, 2, 3], subtests=True)
+        def test_subtests(self, a):
+            pass
+
+    assert run_unittests(TestSomething).wasSuccessful()
+
+    report = recorder.report(slowest=1)
+    qualname = f"{__name__}.{TestSomething.__qualname__}"
+    assert report["functions"] == {
+        f"{qualname}.test_method": 2,
+        f"{qualname}.test_trampolines": 2,
+        f"{qualname}.test_subtests": 3,
+    }
+    assert {"collect_parameters", "count_parametrize_decorators", "set_test_cases"} <= set(
+        report["steps"]
+    )
+    assert report["steps"]["set_test_cases"]["calls"] == 2
+    assert report["steps"]["make_trampoline_factory"]["calls"] == 1
+    assert report["modules"][__name__] > 0
+    assert len(report["cases"]) == 7
+    assert all(case["runs"] == 1 for case in report["cases"].values())
+    assert [case["name"] for case in report["slowest_cases"]] == [
+        f"{qualname}.test_method[0-02]"
+    ]
+    assert report["slowest_cases"][0]["wall"] >= 0.02
+
+    instrumentation.dump(str(tmp_path / "report.json"))
+    assert json.loads((tmp_path / "report.json").read_text())["functions"] == report["functions"]
+
+
+def test_disabled():
+    assert instrumentation.active is None
+
+    class TestSomething(TestCase):
+        @parametrize("a", [1, 2], trampolines=True)
+        def test_method(self, a):
+            pass
+
+    assert not hasattr(TestSomething.__dict__["test_method[1]"], "__wrapped__")
+    with pytest.raises(RuntimeError, match="Instrumentation is not enabled"):
+        instrumentation.dump("never-written.json")
+
+
+def test_enabled_by_env(tmp_path):
+    path = tmp_path / "report.json"
+    code = (
+        "from parametrize import parametrize\n"
+        "@parametrize('a', [1, 2])\n"
+        "def test(a):\n"
+        "    pass\n"
+    )
+    script = tmp_path / "script.py"
+    script.write_text(code)  # decorators are found in source on older pythons
+    env = {**os.environ, instrumentation.INSTRUMENT_ENV_VAR: str(path)}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    subprocess.run([sys.executable, str(script)], env=env, check=True)
+    assert json.loads(path.read_text())["functions"] == {"__main__.test": 2}
@@ -0,0 +1,90 @@
+import importlib
+import json
+import os
+import sys
+import textwrap
+
+import pytest
+
+from parametrize import __main__, manifest
+
+
+# parametrize.parametrize attribute is the function, not the module
+parametrize_module = importlib.import_module("parametrize.parametrize")
+
+
+SOURCE = """
+import unittest
+from parametrize import parametrize
+
+
+class TestSomething(unittest.TestCase):
+    @parametrize("a", [1, 2])
+    @parametrize("b", [3])
+    def test_method(self, a, b):
+        pass
+
+
+@parametrize("c", ["x", "y"])
+def test_function(c):
+    pass
+"""
+
+
+@pytest.fixture
+def tests_module(tmp_path, monkeypatch, request):
+    name = f"test_manifest_{request.node.name}"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(manifest.MANIFEST_ENV_VAR, raising=False)
+    yield name
+    sys.modules.pop(name, None)
+
+
+def import_fresh(name):
+    sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    return importlib.import_module(name)
+
+
+def test_compile(tests_module, tmp_path, capsys):
+    assert __main__.main(["compile", f"{tests_module}.py", "-o", "manifest.json"]) == 0
+    assert "Compiled 2 parametrized function(s) of 1 file(s)" in capsys.readouterr().out
+
+    files = json.loads((tmp_path / "manifest.json").read_text())["files"]
+    functions = files[os.path.realpath(f"{tests_module}.py")]["functions"]
+    assert functions == {
+        "TestSomething.test_method:7": {"decorators": 2},
+        "test_function:13": {"decorators": 1},
+    }
+
+
+def test_manifest_is_used_until_file_changes(tests_module, tmp_path, monkeypatch, mocker):
+    manifest.compile_manifest([f"{tests_module}.py"], "manifest.json")
+    monkeypatch.setenv(manifest.MANIFEST_ENV_VAR, str(tmp_path / "manifest.json"))
+    count = mocker.spy(parametrize_module, "_count_parametrize_decorators")
+
+    module = import_fresh(tests_module)
+    assert count.call_count == 0
+    assert hasattr(module.TestSomething, "test_method[3-2]")
+
+    path = tmp_path / f"{tests_module}.py"
+    os.utime(path, ns=(0, 0))  # same content, e.g. after checkout
+    monkeypatch.setattr(manifest, "_loaded", (None, None))
+    import_fresh(tests_module)
+    assert count.call_count == 0
+
+    path.write_text(path.read_text() + "\n# changed\n")
+    monkeypatch.setattr(manifest, "_loaded", (None, None))
+    import_fresh(tests_module)
+    assert count.call_count == 2
+
+
+def test_compile_reports_import_errors(tmp_path, monkeypatch, capsys):
+    (tmp_path / "test_broken_manifest.py").write_text("raise ImportError('nope')\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    assert __main__.main(["compile", ".", "-o", "manifest.json"]) == 1
+    assert "Failed to import" in capsys.readouterr().err
+    assert not (tmp_path / "manifest.json").exists()
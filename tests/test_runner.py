@@ -0,0 +1,159 @@
+import json
+import textwrap
+import unittest
+from io import StringIO
+from xml.etree import ElementTree
+
+import pytest
+
+from parametrize import __main__, runner
+
+
+SOURCE = """
+import unittest
+from parametrize import parametrize
+
+
+class TestSomething(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ready = True
+
+    @parametrize("a", range(6))
+    def test_method(self, a):
+        self.assertTrue(self.ready)
+        self.assertLess(a, 5)
+
+    @parametrize("b", [1, 2])
+    def test_error(self, b):
+        if b == 2:
+            raise ValueError(b)
+
+    @unittest.skip("not today")
+    def test_skipped(self):
+        pass
+"""
+
+
+@pytest.fixture
+def tests_module(tmp_path, monkeypatch, request):
+    name = f"test_runner_{request.node.name.replace('[', '_').replace(']', '')}"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    return name
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run(tests_module, tmp_path, workers):
+    stream = StringIO()
+    result = runner.run(
+        runner.Discovery(start=str(tmp_path), pattern=f"{tests_module}.py"),
+        workers=workers,
+        junit_xml=str(tmp_path / "junit.xml"),
+        durations=str(tmp_path / "durations.json"),
+        stream=stream,
+    )
+
+    # skipped tests aren't counted as run in some versions of python
+    expected = unittest.TestResult()
+    unittest.TestLoader().discover(str(tmp_path), f"{tests_module}.py")(expected)
+    assert result.testsRun == expected.testsRun
+    assert (len(result.failures), len(result.errors), len(result.skipped)) == (1, 1, 1)
+    output = stream.getvalue()
+    assert "FAIL: test_method[5]" in output
+    assert "ValueError: 2" in output
+    assert "FAILED (failures=1, errors=1, skipped=1)" in output
+
+    suite = ElementTree.parse(tmp_path / "junit.xml").getroot()[0]
+    assert {key: suite.get(key) for key in ("tests", "failures", "errors", "skipped")} == {
+        "tests": "9",
+        "failures": "1",
+        "errors": "1",
+        "skipped": "1",
+    }
+    failure = suite.find("testcase[@name='test_method[5]']/failure")
+    assert failure.get("message") == "AssertionError: 5 not less than 5"
+
+    durations = json.loads((tmp_path / "durations.json").read_text())
+    assert f"{tests_module}.TestSomething.test_method[0]" in durations
+
+
+def run_with_junit_xml(tmp_path, monkeypatch, name, source, workers=1):
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    runner.run(
+        runner.Discovery(start=str(tmp_path), pattern=f"{name}.py"),
+        workers=workers,
+        junit_xml=str(tmp_path / "junit.xml"),
+        stream=StringIO(),
+    )
+    return ElementTree.parse(tmp_path / "junit.xml").getroot()[0]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_junit_xml_of_subtests(tmp_path, monkeypatch, workers):
+    name = f"test_grouped_{workers}"
+    source = """
+        import unittest
+
+
+        class TestGrouped(unittest.TestCase):
+            def test_method(self):
+                for a in [1, 2, 3]:
+                    with self.subTest(a):
+                        self.assertNotEqual(a, 2)
+
+            def test_other(self):
+                pass
+        """
+    suite = run_with_junit_xml(tmp_path, monkeypatch, name, source, workers)
+    assert {key: suite.get(key) for key in ("tests", "failures", "errors")} == {
+        "tests": "2",
+        "failures": "1",
+        "errors": "0",
+    }
+    assert [(case.get("classname"), case.get("name")) for case in suite] == [
+        (f"{name}.TestGrouped", "test_method"),
+        (f"{name}.TestGrouped", "test_other"),
+    ]
+    failure = suite.find("testcase[@name='test_method']/failure")
+    assert failure.get("message") == "1 subtests failed: AssertionError: 2 == 2"
+    assert failure.text.startswith("test_method [2]:\n")
+    assert suite.find("testcase[@name='test_other']/failure") is None
+
+
+def test_junit_xml_of_skipped_subtests(tmp_path, monkeypatch):
+    source = """
+        import unittest
+        from parametrize import param, parametrize
+
+
+        class TestGrouped(unittest.TestCase):
+            @parametrize("a", [1, param(2, skip="not ready"), 3], subtests=True)
+            def test_method(self, a):
+                self.assertNotEqual(a, 3)
+        """
+    suite = run_with_junit_xml(tmp_path, monkeypatch, "test_skipped_subtests", source)
+    assert {key: suite.get(key) for key in ("tests", "failures", "errors")} == {
+        "tests": "1",
+        "failures": "1",
+        "errors": "0",
+    }
+    failure = suite.find("testcase[@name='test_method']/failure")
+    assert failure.get("message") == "1 subtests failed: AssertionError: 3 == 3"
+    assert "not ready" not in failure.text
+
+
+def test_run_parametrized_method_by_name(tests_module, capsys):
+    assert __main__.main([f"{tests_module}.TestSomething.test_error", "-j", "1", "-v"]) == 1
+    output = capsys.readouterr().err
+    assert "test_error[1]" in output
+    assert "Ran 2 tests" in output
+
+
+def test_get_slices():
+    assert runner.get_slices(10, 1) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert runner.get_slices(2, 4) == [(0, 1), (1, 2)]
+    assert runner.get_slices(0, 4) == []
@@ -0,0 +1,98 @@
+import time
+from unittest import TestCase
+
+import pytest
+
+from parametrize import parametrize, sampling
+
+
+@pytest.fixture(autouse=True)
+def no_overrides(monkeypatch):
+    monkeypatch.delenv(sampling.MAX_CASES_ENV_VAR, raising=False)
+    monkeypatch.delenv(sampling.SEED_ENV_VAR, raising=False)
+    yield
+    sampling.configure()
+
+
+def define_test_case(values=range(100), **options):
+    class TestSomething(TestCase):
+        @parametrize("a", values)
+        @parametrize("b", values)
+        @parametrize("c", values)
+        @parametrize("d", values, **options)
+        def test_method(self, a, b, c, d):
+            pass
+
+    return [name for name in vars(TestSomething) if name.startswith("test_method[")]
+
+
+def test_sample_of_huge_product():
+    started = time.perf_counter()
+    names = define_test_case(max_cases=10)
+    assert time.perf_counter() - started < 1  # 100 ** 4 cases are never enumerated
+    assert len(names) == 10
+    assert names == define_test_case(max_cases=10)
+    assert names != define_test_case(max_cases=10, seed=1)
+    assert names == define_test_case(max_cases=10, seed=0)
+
+
+def test_sample_of_product_larger_than_maxsize():
+    class TestSomething(TestCase):
+        @parametrize("a", range(1000))
+        @parametrize("b", range(1000))
+        @parametrize("c", range(1000))
+        @parametrize("d", range(1000))
+        @parametrize("e", range(1000))
+        @parametrize("f", range(1000))
+        @parametrize("g", range(1000), max_cases=3)
+        def test_method(self, a, b, c, d, e, f, g):
+            pass
+
+    assert len([name for name in vars(TestSomething) if name.startswith("test_method[")]) == 3
+
+
+def test_sampled_cases_keep_their_names():
+    all_names = define_test_case(range(5))
+    names = define_test_case(range(5), max_cases=20, seed="nightly")
+    assert len(names) == 20
+    assert names == [name for name in all_names if name in set(names)]
+
+
+def test_sampled_cases_with_repeated_ids_keep_their_names():
+    all_names = define_test_case([1, 1, 2])
+    assert all_names[:4] == [
+        "test_method[1-1-1-1]",
+        "test_method[1-1-1-1:1]",
+        "test_method[1-1-1-2]",
+        "test_method[1-1-1-1:2]",
+    ]
+    for seed in range(10):
+        names = define_test_case([1, 1, 2], max_cases=3, seed=seed)
+        assert names == [name for name in all_names if name in set(names)]
+
+
+def test_overrides(monkeypatch):
+    monkeypatch.setenv(sampling.MAX_CASES_ENV_VAR, "5")
+    assert len(define_test_case()) == 5
+    default_sample = define_test_case()
+
+    monkeypatch.setenv(sampling.SEED_ENV_VAR, "42")
+    assert define_test_case() != default_sample
+    assert len(define_test_case(max_cases=10)) == 5
+
+    sampling.configure(max_cases=0)  # everything
+    assert len(define_test_case(range(3), max_cases=10)) == 81
+
+    with pytest.raises(ValueError, match="max_cases must not be negative"):
+        sampling.configure(max_cases=-1)
+
+
+def test_sample_of_pairwise_cases():
+    names = define_test_case(range(5), strategy="pairwise", max_cases=10)
+    assert len(names) == 10
+    assert set(names) <= set(define_test_case(range(5), strategy="pairwise"))
+
+
+def test_invalid_max_cases():
+    with pytest.raises(ValueError, match="max_cases must be a positive number, got 0"):
+        parametrize("a", [1], max_cases=0)
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import pytest
+
+from parametrize import parametrize, selection
+from parametrize.parametrize import ParametrizeContext
+from parametrize.selection import compile_patterns
+
+
+@pytest.fixture(autouse=True)
+def no_selection(monkeypatch):
+    monkeypatch.delenv(selection.SELECT_ENV_VAR, raising=False)
+    yield
+    selection.configure()
+
+
+def test_compile_patterns():
+    select = compile_patterns(["method[1", "*.TestOther.*[2]"])
+    assert select("module.TestSomething.test_method[1-2]")
+    assert select("module.TestOther.test_method[2]")
+    assert not select("module.TestOther.test_method[3]")
+    assert not select("module.TestSomething.test_method[2-1]")
+
+
+def test_selector_from_env(monkeypatch):
+    assert selection.get_selector() is None
+    monkeypatch.setenv(selection.SELECT_ENV_VAR, "[2]")
+    assert selection.get_selector()("test[2]")
+    assert not selection.get_selector()("test[1]")
+
+    selection.configure(predicate=lambda name: name.endswith("[1]"))
+    assert selection.get_selector()("test[1]")
+
+    with pytest.raises(TypeError, match="Either patterns or predicate must be given, not both"):
+        selection.configure("a", predicate=bool)
+
+
+def define_test_case():
+    class TestSomething(TestCase):
+        @parametrize("a", range(100))
+        @parametrize("b", "xy")
+        def test_method(self, a, b):
+            pass
+
+    return {name for name in vars(TestSomething) if name.startswith("test_method[")}
+
+
+def test_only_selected_cases_are_generated(mocker):
+    selection.configure("test_method[y-42]", "*test_method[x-4?]")
+    make_method = mocker.spy(ParametrizeContext, "make_method")
+    assert define_test_case() == {"test_method[y-42]"} | {f"test_method[x-4{i}]" for i in range(10)}
+    assert make_method.call_count == 11
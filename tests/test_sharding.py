@@ -0,0 +1,98 @@
+import json
+from unittest import TestCase
+
+import pytest
+
+from parametrize import parametrize, sharding
+from parametrize.sharding import Shard, get_case_name
+
+
+@pytest.fixture(autouse=True)
+def no_shard(monkeypatch):
+    for var in (
+        sharding.SHARD_INDEX_ENV_VAR,
+        sharding.SHARD_COUNT_ENV_VAR,
+        sharding.DURATIONS_ENV_VAR,
+    ):
+        monkeypatch.delenv(var, raising=False)
+    yield
+    sharding.configure(None)
+
+
+NAMES = [f"module.test[{i}]" for i in range(100)]
+
+
+def test_every_case_goes_to_exactly_one_shard():
+    selections = [Shard(index, 3).select("module.test", NAMES) for index in range(3)]
+    assert all(sum(selected) == 1 for selected in zip(*selections))
+    assert all(20 < sum(selected) < 45 for selected in selections)
+    assert selections[0] == Shard(0, 3).select("module.test", NAMES)
+
+
+def test_cases_are_balanced_by_durations():
+    durations = {name: float(i) for i, name in enumerate(NAMES[:-1])}
+    loads = []
+    for index in range(4):
+        selected = Shard(index, 4, durations).select("module.test", NAMES)
+        loads.append(sum(durations.get(n, 49) for n, s in zip(NAMES, selected) if s))
+    assert max(loads) - min(loads) <= 49
+    assert sum(loads) == sum(durations.values()) + 49
+
+
+def test_wrong_shard_index():
+    with pytest.raises(ValueError, match=r"Shard index must be in range \[0, 2\), got 2"):
+        Shard(2, 2)
+
+
+def test_shard_from_env(monkeypatch, tmp_path):
+    assert sharding.get_shard() is None
+
+    durations = tmp_path / "durations.json"
+    sharding.save_durations(durations, {"a": 1.0})
+    sharding.save_durations(durations, {"b": 2.0})
+    assert json.loads(durations.read_text()) == {"a": 1.0, "b": 2.0}
+
+    monkeypatch.setenv(sharding.SHARD_INDEX_ENV_VAR, "1")
+    with pytest.raises(RuntimeError, match="must be set for sharding"):
+        sharding.get_shard()
+
+    monkeypatch.setenv(sharding.SHARD_COUNT_ENV_VAR, "2")
+    monkeypatch.setenv(sharding.DURATIONS_ENV_VAR, str(durations))
+    shard = sharding.get_shard()
+    assert (shard.index, shard.count, shard.durations) == (1, 2, {"a": 1.0, "b": 2.0})
+    assert sharding.get_shard() is shard
+
+
+def define_test_case():
+    class TestSomething(TestCase):
+        @parametrize("a", range(5))
+        @parametrize("b", range(4))
+        def test_method(self, a, b):
+            pass
+
+    return {name for name in vars(TestSomething) if name.startswith("test_method[")}
+
+
+def test_only_cases_of_the_shard_are_generated():
+    all_cases = define_test_case()
+    assert len(all_cases) == 20
+
+    shards = []
+    for index in range(3):
+        sharding.configure(index, 3)
+        shards.append(define_test_case())
+
+    assert set().union(*shards) == all_cases
+    assert sum(map(len, shards)) == 20
+
+
+def test_case_name():
+    class TestSomething(TestCase):
+        @parametrize("a", [1])
+        def test_method(self, a):
+            pass
+
+    method = getattr(TestSomething(), "test_method[1]")
+    assert get_case_name(method) == (
+        f"{__name__}.test_case_name.<locals>.TestSomething.test_method[1]"
+    )
@@ -0,0 +1,65 @@
+import os
+import textwrap
+
+from parametrize import source
+from parametrize.source import get_decorator_lines
+
+
+def decorator(func):
+    return func
+
+
+@decorator
+@decorator  # comment
+def decorated():
+    ...
+
+
+def not_decorated():
+    ...
+
+
+def test_get_decorator_lines():
+    assert get_decorator_lines(decorated) == ("@decorator", "@decorator  # comment")
+    assert get_decorator_lines(not_decorated) == ()
+
+
+def test_module_is_parsed_once(mocker):
+    source._modules_index.pop(__file__, None)
+    parse = mocker.spy(source.ast, "parse")
+
+    get_decorator_lines(decorated)
+    get_decorator_lines(not_decorated)
+    get_decorator_lines(test_get_decorator_lines)
+
+    assert parse.call_count == 1
+
+
+def test_index_is_invalidated_when_module_changes(tmp_path):
+    path = tmp_path / "module.py"
+
+    def load(code):
+        path.write_text(textwrap.dedent(code))
+        namespace = {"__name__": "module", "decorator": decorator}
+        exec(compile(path.read_text(), str(path), "exec"), namespace)
+        return namespace["f"]
+
+    f = load(
+        """
+        @decorator
+        def f():
+            ...
+        """
+    )
+    assert get_decorator_lines(f) == ("@decorator",)
+
+    f = load(
+        """
+        @decorator
+        @decorator  # another one
+        def f():
+            ...
+        """
+    )
+    os.utime(path, ns=(0, 0))  # make sure mtime changes
+    assert get_decorator_lines(f) == ("@decorator", "@decorator  # another one")
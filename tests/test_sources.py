@@ -0,0 +1,176 @@
+import array
+from unittest import TestCase
+
+import pytest
+
+from parametrize import from_array, from_file, parametrize
+from tests.utils import run_unittests
+
+
+def cases_of(case, name):
+    return sorted(n for n in vars(case) if n.startswith(f"{name}["))
+
+
+def test_rows_of_buffer_are_views():
+    buffer = array.array("d", [1, 2, 3, 4, 5, 6])
+    points = memoryview(buffer).cast("B").cast("d", (3, 2))
+    rows = []
+
+    class TestSomething(TestCase):
+        @parametrize("point", from_array("point", points))
+        def test_point(self, point):
+            rows.append(point)
+
+        @parametrize("x,y", from_array("x,y", points))
+        def test_coordinates(self, x, y):
+            rows.append((x, y))
+
+    assert cases_of(TestSomething, "test_point") == [f"test_point[{i}]" for i in range(3)]
+    buffer[5] = 60  # changes after decoration are seen by cases, since nothing was copied
+    assert run_unittests(TestSomething).wasSuccessful()
+
+    views = [row for row in rows if isinstance(row, memoryview)]
+    assert [view.tolist() for view in views] == [[1, 2], [3, 4], [5, 60]]
+    assert all(view.obj is buffer for view in views)
+    assert sorted(row for row in rows if isinstance(row, tuple)) == [(1, 2), (3, 4), (5, 60)]
+
+
+def test_one_dimensional_buffer():
+    values = []
+
+    class TestSomething(TestCase):
+        @parametrize("value", from_array("value", bytearray(b"abc")), ids=["a", None, "c"])
+        def test_value(self, value):
+            values.append(value)
+
+    assert cases_of(TestSomething, "test_value") == [
+        "test_value[1]",
+        "test_value[a]",
+        "test_value[c]",
+    ]
+    assert run_unittests(TestSomething).wasSuccessful()
+    assert sorted(values) == [97, 98, 99]
+
+
+def test_callable_ids_decode_rows():
+    class TestSomething(TestCase):
+        @parametrize("n", [1, 2])
+        @parametrize("value", from_array("value", array.array("i", [7, 8])), ids=lambda v: f"v{v}")
+        def test_value(self, value, n):
+            self.assertIn(value, (7, 8))
+
+    assert cases_of(TestSomething, "test_value") == [
+        "test_value[v7-1]",
+        "test_value[v7-2]",
+        "test_value[v8-1]",
+        "test_value[v8-2]",
+    ]
+    assert run_unittests(TestSomething).wasSuccessful()
+
+
+def test_invalid_sources():
+    points = memoryview(array.array("i", range(6))).cast("B").cast("i", (2, 3))
+    with pytest.raises(ValueError, match="can't be split into 2 arguments"):
+        from_array("x,y", points)
+    with pytest.raises(ValueError, match="at least one dimension"):
+        from_array("x", memoryview(array.array("i", [1])).cast("B").cast("i", ()))
+    with pytest.raises(ValueError, match="C-contiguous"):
+        from_array("x", memoryview(bytearray(6))[::2])
+
+    with pytest.raises(ValueError, match="don't match"):
+
+        @parametrize("a,b,c", from_array("x,y,z", points))
+        def test_mismatch(a, b, c):
+            pass
+
+    with pytest.raises(ValueError, match="Wrong number of ids"):
+
+        @parametrize("x,y,z", from_array("x,y,z", points), ids=["only one"])
+        def test_ids(x, y, z):
+            pass
+
+
+def test_numpy_memmap(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "rows.npy"
+    np.save(path, np.arange(12, dtype=np.int64).reshape(4, 3))
+    rows = np.load(path, mmap_mode="r")
+    seen = []
+
+    class TestSomething(TestCase):
+        @parametrize("row", from_array("row", rows))
+        def test_row(self, row):
+            seen.append(row)
+
+    assert len(cases_of(TestSomething, "test_row")) == 4
+    assert run_unittests(TestSomething).wasSuccessful()
+    assert all(np.shares_memory(row, rows) for row in seen)
+
+
+def test_rows_of_csv_are_read_when_cases_run(tmp_path):
+    path = tmp_path / "golden.csv"
+    path.write_text('name,text,expected\nhello,hello,5\nquote,"say ""hi""\nthere",14\n\nempty,,0\n')
+    source = from_file(path, "text,expected", ids="name")
+    assert len(source) == 3
+    assert source.offsets.itemsize == 8
+    seen = []
+
+    class TestSomething(TestCase):
+        @parametrize("text,expected", source)
+        def test_len(self, text, expected):
+            seen.append(text)
+            self.assertEqual(len(text), int(expected))
+
+    assert seen == []
+    assert cases_of(TestSomething, "test_len") == [
+        "test_len[empty]",
+        "test_len[hello]",
+        "test_len[quote]",
+    ]
+    assert run_unittests(TestSomething).wasSuccessful()
+    assert sorted(seen) == ["", "hello", 'say "hi"\nthere']
+
+
+def test_rows_of_json_lines(tmp_path):
+    path = tmp_path / "golden.jsonl"
+    path.write_text('{"a": 1, "b": [2]}\n\n{"b": null, "a": "x"}\n')
+    assert list(from_file(path, "a,b")) == [(1, [2]), ("x", None)]
+    assert list(from_file(path, "a,b", ids="a").ids) == ["1", "x"]
+
+    path.write_text('[1, 2]\n[3, 4]\n')
+    assert from_file(path, ["a", "b"])[-1] == (3, 4)
+
+    class TestSomething(TestCase):
+        @parametrize("a,b", from_file(path, "a,b"))
+        def test_order(self, a, b):
+            self.assertLess(a, b)
+
+    assert cases_of(TestSomething, "test_order") == ["test_order[0]", "test_order[1]"]
+    assert run_unittests(TestSomething).wasSuccessful()
+
+
+def test_invalid_files(tmp_path):
+    path = tmp_path / "cases.csv"
+    path.write_text("a,b\n1,2\n3\n")
+    with pytest.raises(ValueError, match=r"No columns \['c'\]"):
+        from_file(path, "a,c")
+    with pytest.raises(ValueError, match="Wrong number of values in row 1"):
+        from_file(path, "a")[1]
+    with pytest.raises(ValueError, match="Can't guess format"):
+        from_file(tmp_path / "cases.txt", "a")
+    with pytest.raises(ValueError, match="Unterminated"):
+        path.write_text('a\n"1\n')
+        from_file(path, "a")
+
+    path.write_text("a\n1\n")
+    source = from_file(path, "a")
+    path.write_text("a\n12\n")
+    with pytest.raises(RuntimeError, match="changed after its rows were indexed"):
+        source[0]
+
+    path = tmp_path / "cases.jsonl"
+    path.write_text('{"a": 1}\n')
+    with pytest.raises(ValueError, match="No 'b' key in row 0"):
+        from_file(path, "a,b")[0]
+    with pytest.raises(ValueError, match="No 'id' key in row 0"):
+        from_file(path, "a", ids="id")
@@ -0,0 +1,92 @@
+from itertools import combinations, product
+from unittest import TestCase
+
+import pytest
+
+from parametrize import parametrize
+from parametrize.strategies import covering_array, get_strength
+
+
+def assert_covered(sizes, strength, rows):
+    for columns in combinations(range(len(sizes)), min(strength, len(sizes))):
+        expected = set(product(*(range(sizes[column]) for column in columns)))
+        assert {tuple(row[column] for column in columns) for row in rows} == expected
+
+
+@pytest.mark.parametrize(
+    "sizes,strength",
+    [
+        ([5] * 6, 2),
+        ([2] * 10, 2),
+        ([3, 7, 2, 5], 2),
+        ([4] * 6, 3),
+        ([1, 3, 2], 2),
+        ([3, 3], 5),
+    ],
+)
+def test_covering_array(sizes, strength):
+    rows = covering_array(sizes, strength)
+    assert_covered(sizes, strength, rows)
+    assert rows == covering_array(sizes, strength)
+    assert len(set(rows)) == len(rows)
+
+
+def test_covering_array_sizes():
+    assert len(covering_array([5] * 6, 2)) < 40
+    assert len(covering_array([3, 7, 2, 5], 2)) == 35  # can't be less than 7 * 5
+    assert covering_array([3, 0, 2], 2) == []
+
+
+def test_get_strength():
+    assert get_strength(None) is None
+    assert get_strength("product") is None
+    assert get_strength("pairwise") == 2
+    assert get_strength("3-wise") == 3
+    with pytest.raises(ValueError, match="Unknown strategy 'triples'"):
+        get_strength("triples")
+
+
+def test_pairwise_parametrize():
+    def define(strategy):
+        class TestSomething(TestCase):
+            @parametrize("a", range(5))
+            @parametrize("b", range(5))
+            @parametrize("c,d", [(1, 1), (2, 2), (3, 3)])
+            @parametrize("e", "xyz", strategy=strategy)
+            def test_method(self, a, b, c, d, e):
+                pass
+
+        return [name for name in vars(TestSomething) if name.startswith("test_method[")]
+
+    all_names = define(None)
+    names = define("pairwise")
+    assert len(all_names) == 225 and len(names) == 25
+    assert set(names) <= set(all_names)
+    assert names == sorted(names, key=all_names.index)  # same order as in the product
+
+    ids = [name.partition("[")[2].rstrip("]").split("-") for name in names]
+    # the bottom decorator is applied first, so its values go first
+    rows = [["xyz".index(e), int(c) - 1, int(b), int(a)] for e, c, _, b, a in ids]
+    assert_covered([3, 3, 5, 5], 2, rows)
+
+
+def test_pairwise_cases_with_repeated_ids():
+    def define(strategy):
+        class TestSomething(TestCase):
+            @parametrize("a", [3, 3, 3])
+            @parametrize("b", [2, 2, 2])
+            @parametrize("c", [1, 1, 1], strategy=strategy)
+            def test_method(self, a, b, c):
+                pass
+
+        return [name for name in vars(TestSomething) if name.startswith("test_method[")]
+
+    all_names = define(None)
+    assert all_names[:2] == ["test_method[1-2-3]", "test_method[1-2-3:1]"]
+    assert len(set(all_names)) == 27
+    assert set(define("pairwise")) <= set(all_names)
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        parametrize("a", [1], strategy="all")
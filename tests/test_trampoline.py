@@ -0,0 +1,119 @@
+import inspect
+from functools import wraps
+from unittest import TestCase
+
+import pytest
+
+from parametrize import parametrize
+from parametrize.trampoline import make_trampoline_factory
+from tests.utils import run_unittests
+
+
+def make(func, *values, argnames=("a",), wrapped=False):
+    signature = None if wrapped else inspect.signature(func)
+    factory = make_trampoline_factory(func, signature, argnames)
+    return factory("f[case]", "Test.f[case]", values)
+
+
+def test_signature_is_mirrored():
+    def f(self, a, fixture, *, b=2, **kwargs):
+        return self, a, fixture, b, kwargs
+
+    trampoline = make(f, 1)
+    assert str(inspect.signature(trampoline)) == "(self, fixture, *, a=1, b=2, **kwargs)"
+    assert trampoline.__name__ == "f[case]"
+    assert trampoline.__qualname__ == "Test.f[case]"
+    assert trampoline.__code__.co_filename == f.__code__.co_filename
+    assert trampoline("self", "fixture") == ("self", 1, "fixture", 2, {})
+    assert trampoline("self", fixture=0, b=3, c=4) == ("self", 1, 0, 3, {"c": 4})
+
+
+def test_var_positional_arguments():
+    def f(self, *args, a):
+        return self, args, a
+
+    assert str(inspect.signature(make(f, 1))) == "(self, *args, a=1)"
+    assert make(f, 1)("self", 2) == ("self", (2,), 1)
+
+    def f(self, a, *args):
+        return self, a, args
+
+    # positional argument can't be passed by keyword together with *args
+    assert str(inspect.signature(make(f, 1))) == "(*__args__, a=1, **__kwargs__)"
+
+
+def test_arguments_after_parametrized_one_are_passed_by_keyword():
+    def f(a, fixture=0):
+        return a, fixture
+
+    trampoline = make(f, 1)
+    assert str(inspect.signature(trampoline)) == "(fixture=0, *, a=1)"
+    assert trampoline() == (1, 0)
+    assert trampoline(2) == (1, 2)
+
+
+def test_wrapped_function_is_called_with_any_arguments():
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @decorator
+    def f(self, a, b=2):
+        return self, a, b
+
+    trampoline = make(f, 1, wrapped=True)
+    assert inspect.signature(trampoline, follow_wrapped=False).parameters.keys() == {
+        "__args__",
+        "a",
+        "__kwargs__",
+    }
+    assert trampoline("self") == ("self", 1, 2)
+    assert trampoline("self", b=3) == ("self", 1, 3)
+
+
+def test_arguments_named_as_builtins():
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @decorator
+    def f(self, len):
+        return self, len
+
+    trampoline = make(f, 1, argnames=("len",), wrapped=True)
+    assert trampoline("self") == ("self", 1)
+
+
+@pytest.mark.parametrize("name", ["__args__", "__kwargs__", "__parametrized_function__"])
+def test_reserved_argument_names(name):
+    def f(**kwargs):
+        return kwargs
+
+    with pytest.raises(TypeError, match=name):
+        make(f, 1, argnames=(name,))
+
+
+def test_trampolines_with_unittest():
+    class TestSomething(TestCase):
+        @parametrize("a", (1, 2), trampolines=True)
+        @parametrize("b", (3,))
+        def test_method(self, a, b):
+            """Documented"""
+            self.assertEqual(a + b, 4)
+
+    method = TestSomething.__dict__["test_method[3-2]"]
+    assert inspect.isfunction(method)
+    assert method.__doc__ == "Documented"
+
+    result = run_unittests(TestSomething)
+    assert result.testsRun == 2
+    [(test, traceback)] = result.failures
+    assert test._testMethodName == "test_method[3-2]"
+    assert "self.assertEqual(a + b, 4)" in traceback
+    assert "__parametrized_function__" not in traceback
@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+import pytest
+
+from parametrize import lazy, parametrize, selection, values
+from tests.utils import run_unittests
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    values.configure_cache()
+    yield
+    values.configure_cache()
+    selection.configure()
+
+
+@pytest.mark.parametrize("trampolines", [False, True])
+def test_values_are_built_when_cases_run(trampolines):
+    built = []
+
+    def dataset():
+        built.append("dataset")
+        return [1, 2, 3]
+
+    class TestSomething(TestCase):
+        @parametrize("n", [1, 2])
+        @parametrize("data", [lazy(dataset), lazy(lambda: [], id="empty")], trampolines=trampolines)
+        def test_method(self, data, n):
+            self.assertIsInstance(data, list)
+
+    assert built == []
+    assert {name for name in vars(TestSomething) if name.startswith("test_method[")} == {
+        "test_method[dataset-1]",
+        "test_method[dataset-2]",
+        "test_method[empty-1]",
+        "test_method[empty-2]",
+    }
+
+    result = run_unittests(TestSomething)
+    assert result.wasSuccessful() and result.testsRun == 4
+    assert built == ["dataset"]  # shared by the cases
+
+
+def test_values_of_unselected_cases_are_never_built():
+    def fail():
+        raise AssertionError("must not be built")
+
+    selection.configure("[used]")
+
+    class TestSomething(TestCase):
+        @parametrize("data", [lazy(fail, id="unused"), lazy(list, id="used")])
+        def test_method(self, data):
+            self.assertEqual(data, [])
+
+    result = run_unittests(TestSomething)
+    assert result.wasSuccessful() and result.testsRun == 1
+
+
+def test_lru_eviction():
+    built = []
+    first, second, third = (lazy(lambda n=n: built.append(n) or [n] * 10) for n in range(3))
+
+    values.configure_cache(maxsize=2)
+    for value in (first, second, first, third, first, second):
+        value.resolve()
+    assert built == [0, 1, 2, 1]  # second was evicted by third, since first was used recently
+
+    built.clear()
+    values.configure_cache(maxsize=None, maxbytes=25, sizeof=len)
+    for value in (first, second, first, third, second):
+        value.resolve()
+    assert built == [0, 1, 2, 1]
+    assert values._cache.nbytes == 20
+
+
+def test_factory_must_be_callable():
+    with pytest.raises(TypeError, match="factory must be callable"):
+        lazy([1, 2, 3])
@@ -0,0 +1,176 @@
+import pytest
+
+
+@pytest.fixture
+def run_pytest(pytester):
+    def run(code, *args):
+        pytester.makepyfile(code)
+        return pytester.runpytest_inprocess("-v", "-p", "no:cacheprovider", *args)
+
+    return run
+
+
+def test_functions_and_classes(run_pytest):
+    result = run_pytest(
+        """
+        import unittest
+        import pytest
+        from parametrize import parametrize
+
+        @parametrize("a", (1, 2))
+        def test_function(a, tmp_path):
+            assert tmp_path.exists()
+            assert a == 1
+
+        class TestPlain:
+            @parametrize("a,b", [(1, 2), (3, 4)])
+            @pytest.mark.skipif(True, reason="marked")
+            def test_skipped(self, a, b):
+                ...
+
+            @parametrize("a", (1, 2))
+            def test_method(self, a):
+                assert a == 1
+
+        class TestUnittest(unittest.TestCase):
+            @parametrize("a", (1, 2))
+            def test_method(self, a):
+                \"\"\"Documented\"\"\"
+                self.assertEqual(a, 1)
+        """
+    )
+    result.assert_outcomes(passed=3, failed=3, skipped=2)
+    result.stdout.fnmatch_lines_random(
+        [
+            "*::test_function[[]1[]] PASSED*",
+            "*::test_function[[]2[]] FAILED*",
+            "*::TestPlain::test_skipped[[]1-2[]] SKIPPED*",
+            "*::TestPlain::test_method[[]2[]] FAILED*",
+            "*::TestUnittest::test_method[[]1[]] PASSED*",
+        ]
+    )
+
+
+def test_trampolines(run_pytest):
+    result = run_pytest(
+        """
+        from parametrize import parametrize
+
+        @parametrize("a", (1, 2), trampolines=True)
+        def test_function(tmp_path, a):
+            assert tmp_path.exists()
+            assert a == 1
+
+        class TestPlain:
+            @parametrize("a", (1, 2), trampolines=True)
+            def test_method(self, a):
+                assert a == 1
+        """
+    )
+    result.assert_outcomes(passed=2, failed=2)
+    result.stdout.fnmatch_lines_random(["*::test_function[[]2[]] FAILED*"])
+    # trampoline frame is hidden
+    result.stdout.no_fnmatch_line("*__parametrized_function__*")
+
+
+def test_param(run_pytest):
+    result = run_pytest(
+        """
+        from parametrize import param, parametrize
+
+        @parametrize("a", [1, param(2, skip="not ready"), param(3, id="three")])
+        def test_function(a):
+            assert a != 2
+        """
+    )
+    result.assert_outcomes(passed=2, skipped=1)
+    result.stdout.fnmatch_lines_random(["*::test_function[[]three[]] PASSED*"])
+
+
+NATIVE_SOURCE = """
+    import unittest
+    import pytest
+    from parametrize import lazy, param, parametrize
+
+    @parametrize("a", (1, 2, 1.5))
+    @parametrize("b", [param(3, skip="not ready"), 4])
+    def test_function(a, b, tmp_path):
+        assert tmp_path.exists()
+        assert a == 1
+
+    class TestPlain:
+        @parametrize("a,b", [(lazy(lambda: 1), 2), (3, 4)], ids=["first", "second"])
+        def test_method(self, a, b):
+            assert a == 1
+
+        @parametrize("word", ["café", "tea"])
+        def test_word(self, word):
+            assert word.isascii()
+
+    class TestUnittest(unittest.TestCase):
+        @parametrize("a", (1, 2))
+        def test_method(self, a):
+            self.assertEqual(a, 1)
+"""
+
+
+def test_native_parametrization_keeps_ids(run_pytest):
+    plugin = ("-p", "parametrize.pytest_plugin")
+    regular = run_pytest(NATIVE_SOURCE, "--collect-only", "-q", *plugin)
+    native = run_pytest(NATIVE_SOURCE, "--collect-only", "-q", *plugin, "--parametrize-native")
+
+    def collected(result):
+        return [line for line in result.outlines if line.lstrip().startswith("<")]
+
+    assert collected(native) == collected(regular)
+    native.stdout.fnmatch_lines_random(["*test_function[[]3-1-5[]]*", "*test_method[[]first[]]*"])
+    # pytest would escape non-ASCII ids, so these cases are not parametrized natively
+    native.stdout.fnmatch_lines_random(["*test_word[[]café[]]*"])
+
+
+def test_native_parametrization(run_pytest):
+    result = run_pytest(NATIVE_SOURCE, "-p", "parametrize.pytest_plugin", "--parametrize-native")
+    result.assert_outcomes(passed=4, failed=5, skipped=3)
+
+    marked = run_pytest(
+        """
+        import pytest
+        from parametrize import parametrize
+
+        @parametrize("a", (1, 2))
+        def test_function(a):
+            ...
+
+        def test_marked(request):
+            marks = [m.name for m in request.node.parent.obj.test_function.pytestmark]
+            assert marks == ["parametrize"]
+        """,
+        "-p",
+        "parametrize.pytest_plugin",
+        "--parametrize-native",
+    )
+    marked.assert_outcomes(passed=3)
+
+
+def test_rows_of_files_are_read_when_cases_run(run_pytest, pytester):
+    pytester.makefile(".jsonl", cases='{"a": 1}\n{"a": 2}\n{"a": 3}\n')
+    result = run_pytest(
+        """
+        from parametrize import from_file, parametrize
+        from parametrize.sources import FileRows
+
+        reads = []
+        get_row = FileRows.get_row
+        FileRows.get_row = lambda self, position: reads.append(position) or get_row(self, position)
+
+        @parametrize("a", from_file("cases.jsonl", "a"))
+        def test_function(a):
+            assert len(reads) == a
+
+        class TestPlain:
+            @parametrize("a", from_file("cases.jsonl", "a"))
+            def test_method(self, a):
+                assert len(reads) == a + 3
+        """
+    )
+    result.assert_outcomes(passed=6)
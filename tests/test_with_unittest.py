@@ -1,15 +1,15 @@
-from io import StringIO
+import asyncio
+import threading
 from itertools import chain, product
-from typing import List, Tuple, Type
-from unittest import TestCase, TextTestRunner, defaultTestLoader, mock
+from typing import List, Tuple
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
 
-from parametrize import parametrize
-from parametrize.parametrize import UnparametrizedMethod
+import pytest
 
-
-def run_unittests(case: Type[TestCase]):
-    suite = defaultTestLoader.loadTestsFromTestCase(case)
-    return TextTestRunner(stream=StringIO()).run(suite)
+from parametrize import param, parametrize
+from parametrize.grouped import CasesFailed
+from parametrize.parametrize import LazyParametrizedMethod, ParametrizedMethod, UnparametrizedMethod
+from tests.utils import run_unittests
 
 
 def as_tuples(sequence):
@@ -207,3 +207,230 @@ def test_pre_parametrized_decorators(mocker):
         ],
     )
     assert test_mock.mock_calls == [mocker.call(*chain(*v)) for v in all_cases]
+
+
+def test_lazy_parametrize(mocker):
+    test_mock = mocker.Mock("test_mock")
+    values = [1, 2, 3]
+
+    class TestSomething(TestCase):
+        @parametrize("a", values, lazy=True)
+        def test_method(self, a):
+            self.assertEqual(test_mock.return_value, test_mock(a))
+
+    assert all(
+        isinstance(TestSomething.__dict__[f"test_method[{v}]"], LazyParametrizedMethod)
+        for v in values
+    )
+    assert_tests_passed(TestSomething, tests_run=3)
+    assert not any(
+        isinstance(TestSomething.__dict__[f"test_method[{v}]"], LazyParametrizedMethod)
+        for v in values
+    )
+    assert test_mock.mock_calls == [mocker.call(v) for v in values]
+
+
+def test_lazy_parametrize_from_env(monkeypatch):
+    monkeypatch.setenv("PARAMETRIZE_LAZY", "1")
+
+    class TestSomething(TestCase):
+        @A_B_PARAMETERS
+        def test_method(self, a, b):
+            self.assertLess(a, b)
+
+    assert isinstance(TestSomething.__dict__["test_method[1-2]"], LazyParametrizedMethod)
+    assert_tests_passed(TestSomething, tests_run=3)
+
+
+def test_lazy_parametrize_outside_of_test_case():
+    class TestSomething:
+        @parametrize("a", (1, 2), lazy=True)
+        def test_method(self, a):
+            return a
+
+    # pytest looks for tests in __dict__ of plain classes, so placeholders can't be used there
+    assert isinstance(TestSomething.__dict__["test_method[1]"], ParametrizedMethod)
+    assert TestSomething().__getattribute__("test_method[2]")() == 2
+
+
+def test_custom_ids():
+    class TestSomething(TestCase):
+        @parametrize("a", [1, 2], ids=["one", None])
+        @parametrize("b", ["x" * 100, "x" * 100], ids=lambda v: f"len{len(v)}")
+        def test_method(self, a, b):
+            pass
+
+    assert {name for name in TestSomething.__dict__ if name.startswith("test_method[")} == {
+        "test_method[len100-one]",
+        "test_method[len100-2]",
+        "test_method[len100-one:1]",
+        "test_method[len100-2:1]",
+    }
+    assert_tests_passed(TestSomething, tests_run=4)
+
+
+def test_generators_as_argvalues():
+    rows = ((value for value in (i, str(i))) for i in range(3000))
+    consumed = []
+
+    def track(values):
+        for value in values:
+            consumed.append(value)
+            yield value
+
+    class TestSomething(TestCase):
+        @parametrize("a,b", rows)
+        @parametrize("c", track(iter([True])))
+        def test_method(self, a, b, c):
+            self.assertEqual(str(a), b)
+
+    assert consumed == [True]
+    assert "test_method[True-2999-2999]" in TestSomething.__dict__
+    assert_tests_passed(TestSomething, tests_run=3000)
+
+
+def test_case_values_are_decoded_from_index():
+    class TestSomething(TestCase):
+        @parametrize("a", [1, 2, 3])
+        @parametrize("b,c", [("x", "y"), ("z", "w")])
+        @parametrize("d", [True, False])
+        def test_method(self, a, b, c, d):
+            pass
+
+    context = TestSomething.__dict__["test_method[True-x-y-1]"].context
+    cases = list(product([(True,), (False,)], [("x", "y"), ("z", "w")], [(1,), (2,), (3,)]))
+    assert [context.get_case_values(i) for i in range(len(cases))] == [
+        tuple(chain(*case)) for case in cases
+    ]
+    assert context.get_case_parameters(7) == {"d": False, "b": "x", "c": "y", "a": 2}
+    assert TestSomething.__dict__["test_method[False-x-y-2]"].index == 7
+
+
+def test_param(mocker):
+    test_mock = mocker.Mock("test_mock")
+
+    class TestSomething(TestCase):
+        @parametrize(
+            "a",
+            [
+                param((1, 2), id="pair"),
+                param(3, skip="not ready"),
+                pytest.param(4, marks=pytest.mark.skipif(True, reason="condition")),
+                pytest.param(5, marks=[pytest.mark.skipif(False, reason="never")], id="five"),
+            ],
+        )
+        def test_method(self, a):
+            test_mock(a)
+
+    result = run_unittests(TestSomething)
+    assert sorted(reason for _, reason in result.skipped) == ["condition", "not ready"]
+    assert sorted(test_mock.mock_calls, key=repr) == [mocker.call((1, 2)), mocker.call(5)]
+    assert {name for name in vars(TestSomething) if name.startswith("test_method[")} == {
+        "test_method[pair]",
+        "test_method[3]",
+        "test_method[4]",
+        "test_method[five]",
+    }
+
+
+def test_subtests(mocker):
+    test_mock = mocker.Mock("test_mock")
+
+    class TestSomething(TestCase):
+        @parametrize("b", [3, 4])
+        @parametrize("a", [1, 2, param(0, skip="not ready")], subtests=True)
+        def test_method(self, a, b):
+            test_mock(a, b)
+            self.assertNotEqual((a, b), (2, 3))
+
+    assert [name for name in vars(TestSomething) if name.startswith("test_method")] == [
+        "test_method"
+    ]
+
+    result = run_unittests(TestSomething)
+    assert result.testsRun == 1
+    assert [str(test).rsplit(" ", 1)[-1] for test, _ in result.failures] == ["[2-3]"]
+    assert [reason for _, reason in result.skipped] == ["not ready"] * 2
+    assert test_mock.mock_calls == [
+        mocker.call(a, b) for a, b in [(1, 3), (1, 4), (2, 3), (2, 4)]
+    ]
+
+
+def test_subtests_outside_of_test_case():
+    @parametrize("a", [1, 2, 3], subtests=True)
+    def test_function(a):
+        assert a != 2
+
+    with pytest.raises(CasesFailed, match=r"1 case\(s\) failed:\n\[2\] AssertionError"):
+        test_function()
+
+
+def test_async_methods_are_awaited():
+    class TestSomething(IsolatedAsyncioTestCase):
+        @parametrize("a", [1, 2, 3])
+        async def test_method(self, a):
+            await asyncio.sleep(0)
+            self.assertLess(a, 3)
+
+    result = run_unittests(TestSomething)
+    assert result.testsRun == 3
+    assert [str(test).split()[0] for test, _ in result.failures] == ["test_method[3]"]
+
+
+def test_concurrent_cases():
+    running = []
+    overlapped = []
+
+    class TestSomething(IsolatedAsyncioTestCase):
+        @parametrize("a", [1, 2, 3, 4, param(5, skip="not ready")], concurrency=2)
+        async def test_method(self, a):
+            running.append(a)
+            overlapped.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(a)
+            self.assertNotEqual(a, 3)
+
+    assert "test_method" in vars(TestSomething)
+    assert not any(name.startswith("test_method[") for name in vars(TestSomething))
+
+    result = run_unittests(TestSomething)
+    assert result.testsRun == 1
+    assert len(overlapped) == 4 and max(overlapped) == 2
+    assert [str(test).rsplit(" ", 1)[-1] for test, _ in result.failures] == ["[3]"]
+    assert [reason for _, reason in result.skipped] == ["not ready"]
+
+
+def test_concurrency_requires_async_function():
+    with pytest.raises(TypeError, match="concurrency can only be used with async functions"):
+
+        class TestSomething(TestCase):
+            @parametrize("a", [1, 2], concurrency=2)
+            def test_method(self, a):
+                pass
+
+
+def test_cases_in_threads():
+    barrier = threading.Barrier(2, timeout=5)  # breaks unless two cases run at the same time
+    threads = set()
+
+    class TestSomething(TestCase):
+        @parametrize("a", [1, 2, 3, 4], workers=2)
+        def test_method(self, a):
+            barrier.wait()
+            threads.add(threading.get_ident())
+            self.assertNotEqual(a, 4)
+
+    result = run_unittests(TestSomething)
+    assert result.testsRun == 1
+    assert len(threads) == 2
+    assert [str(test).rsplit(" ", 1)[-1] for test, _ in result.failures] == ["[4]"]
+    assert not result.errors
+
+
+def test_workers_and_concurrency_are_exclusive():
+    with pytest.raises(TypeError, match="Either concurrency or workers can be given, not both"):
+
+        @parametrize("a", [1, 2], workers=2)
+        @parametrize("b", [1, 2], concurrency=2)
+        async def test_function(a, b):
+            pass
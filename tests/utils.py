@@ -0,0 +1,8 @@
+from io import StringIO
+from typing import Type
+from unittest import TestCase, TextTestRunner, defaultTestLoader
+
+
+def run_unittests(case: Type[TestCase]):
+    suite = defaultTestLoader.loadTestsFromTestCase(case)
+    return TextTestRunner(stream=StringIO()).run(suite)